@@ -1,27 +1,61 @@
 from flask import Flask
-from dotenv import load_dotenv
-from config.db import init_db
-from flask_jwt_extended import JWTManager
-from routes.friends import friends
-from routes.pokemon_owned import pokemon_owned
-from routes.players import player
-from routes.capture import capture_pokemon
-from routes.trade import trade
 
-app = Flask(__name__)
 
-jwt = JWTManager()
+def create_app(config=None):
+    # SQLAlchemy, el stack de JWT y los blueprints se cargan al crear la app,
+    # no al importar este módulo
+    from config.db import check_schema_version, create_schema, init_db
+    from helpers.auth import CachedJWTManager
+    from helpers.instrumentation import METRICS_ENABLED, init_instrumentation
+    from helpers.json_provider import JSONProvider
+    from helpers.capture_sampler import capture_sampler
+    from routes.friends import friends
+    from routes.pokemon_owned import pokemon_owned
+    from routes.players import player
+    from routes.capture import capture_pokemon
+    from routes.trade import trade
+    from routes.metrics import metrics
 
-load_dotenv()
+    app = Flask(__name__)
+    app.json = JSONProvider(app)
 
-init_db(app)
-jwt.init_app(app)
+    init_db(app)
+    if config:
+        app.config.update(config)
+
+    # SCHEMA_MODE: "create" crea tablas (solo desarrollo), "check" valida el
+    # sello de Alembic y "skip" no toca el esquema. Con gunicorn la validación
+    # la hace el maestro una sola vez (gunicorn.conf.py), no cada worker.
+    schema_mode = app.config.get("SCHEMA_MODE", "skip")
+    if schema_mode == "create":
+        create_schema()
+    elif schema_mode == "check":
+        check_schema_version()
+
+    CachedJWTManager(app)
+
+    # Latencia, consultas por petición, consultas lentas y perfilado con el
+    # header X-Profile (ver helpers/instrumentation.py)
+    if app.config.get("METRICS_ENABLED", METRICS_ENABLED):
+        init_instrumentation(app)
+
+    # Especies en memoria; si aún no hay especies (o PRELOAD_SPECIES es False)
+    # se cargan en la primera captura
+    if app.config.get("PRELOAD_SPECIES", True):
+        try:
+            capture_sampler.reload()
+        except ValueError:
+            pass
+
+    app.register_blueprint(player)
+    app.register_blueprint(capture_pokemon)
+    app.register_blueprint(pokemon_owned)
+    app.register_blueprint(friends)
+    app.register_blueprint(trade)
+    app.register_blueprint(metrics)
+
+    return app
 
-app.register_blueprint(player)
-app.register_blueprint(capture_pokemon)
-app.register_blueprint(pokemon_owned)
-app.register_blueprint(friends)
-app.register_blueprint(trade)
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000)
+    create_app({"SCHEMA_MODE": "create"}).run(host="0.0.0.0", port=5000)
@@ -0,0 +1,28 @@
+# Modo ASGI opcional:
+#
+#   CACHE_URL=redis://localhost:6379/0 \
+#       uvicorn asgi:application --host 0.0.0.0 --port 5000 --workers 4
+#
+# Con --workers > 1 la caché de respuestas tiene que ser compartida (Redis);
+# sin CACHE_URL las respuestas no se cachean (ver helpers/cache.py).
+#
+# uvicorn atiende las conexiones (keep-alive, clientes lentos o inactivos) en
+# su event loop sin ocupar un hilo por cliente. Las vistas siguen siendo las
+# mismas de routes/ y corren en un pool acotado de hilos, solo mientras hay una
+# petición en curso, así que los contratos JSON no cambian y app.py / gunicorn
+# siguen funcionando igual.
+#
+# ASGI_THREADS limita las vistas simultáneas por worker; por defecto es el
+# total de conexiones del pool de la base para que ningún hilo espere por una.
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from app import create_app
+from config.db import db_settings
+
+ASGI_THREADS = int(
+    os.getenv("ASGI_THREADS", str(db_settings.pool_size + db_settings.max_overflow))
+)
+
+application = WSGIMiddleware(create_app(), workers=ASGI_THREADS)
@@ -0,0 +1,64 @@
+# Costo de autenticación por petición: JWTManager contra CachedJWTManager
+# sobre una ruta protegida que no toca la base.
+#
+#   python benchmarks/auth.py [--requests 5000] [--tokens 50]
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify  # noqa: E402
+from flask_jwt_extended import (  # noqa: E402
+    JWTManager,
+    create_access_token,
+    get_jwt_identity,
+    jwt_required,
+)
+
+from helpers.auth import CachedJWTManager  # noqa: E402
+
+
+def build_app(manager_class):
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "benchmark-secret-key-with-enough-length"
+    manager_class(app)
+
+    @app.route("/protected")
+    @jwt_required()
+    def protected():
+        return jsonify({"id": get_jwt_identity()})
+
+    return app
+
+
+def run(manager_class, requests, tokens):
+    app = build_app(manager_class)
+    with app.app_context():
+        headers = [
+            {"Authorization": f"Bearer {create_access_token(identity=f'p{i}')}"}
+            for i in range(tokens)
+        ]
+
+    client = app.test_client()
+    start = time.perf_counter()
+    for i in range(requests):
+        response = client.get("/protected", headers=headers[i % tokens])
+        assert response.status_code == 200
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Auth overhead benchmark")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--tokens", type=int, default=50)
+    args = parser.parse_args()
+
+    for manager_class in (JWTManager, CachedJWTManager):
+        per_request = run(manager_class, args.requests, args.tokens)
+        print(f"{manager_class.__name__:<18} {per_request:8.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Generación de IDs: create_id original (random.choice por carácter) contra
+# helpers/ids.py
+#
+#   python benchmarks/ids.py [--number 100000]
+import argparse
+import os
+import random
+import string
+import sys
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helpers import ids  # noqa: E402
+
+
+def legacy_create_id(length):
+    characters = string.ascii_letters + string.digits
+    return "".join(random.choice(characters) for _ in range(length))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ID generation benchmark")
+    parser.add_argument("--number", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=1_000)
+    args = parser.parse_args()
+
+    cases = [
+        ("legacy create_id(32)", lambda: legacy_create_id(32)),
+        ("random_id(32)", lambda: ids.random_id(32)),
+        ("legacy create_id(24)", lambda: legacy_create_id(24)),
+        ("sortable_id(24)", lambda: ids.sortable_id(24)),
+        ("uuid4", lambda: str(uuid.uuid4())),
+        ("uuid7", ids.uuid7),
+    ]
+    for name, fn in cases:
+        seconds = timeit.timeit(fn, number=args.number)
+        print(f"{name:<24} {seconds / args.number * 1e6:8.3f} us/id")
+
+    batches = max(args.number // args.batch, 1)
+    seconds = timeit.timeit(
+        lambda: ids.sortable_ids(args.batch, 24), number=batches
+    )
+    per_id = seconds / (batches * args.batch) * 1e6
+    print(f"{f'sortable_ids({args.batch}, 24)':<24} {per_id:8.3f} us/id")
+
+
+if __name__ == "__main__":
+    main()
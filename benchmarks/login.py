@@ -0,0 +1,105 @@
+# Throughput de /login a distintos niveles de concurrencia, con bcrypt en el
+# pool de procesos (helpers/passwords.py) y en el hilo de la petición:
+#
+#   python benchmarks/login.py [--levels 1,4,16,64] [--requests 200]
+#
+# Usa la base de DB_URL; crea la tabla player si falta y un jugador de
+# prueba. El costo de bcrypt sale de BCRYPT_LOG_ROUNDS y el tamaño del pool
+# de PASSWORD_HASH_WORKERS / PASSWORD_HASH_QUEUE, como en la app. Las
+# respuestas 503 son carga descartada por el pool, no errores.
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select  # noqa: E402
+
+from app import create_app  # noqa: E402
+from config.db import SessionLocal, get_engine  # noqa: E402
+from helpers import passwords  # noqa: E402
+from models.models import Player  # noqa: E402
+from routes import players  # noqa: E402
+
+EMAIL = "login-bench@example.com"
+PASSWORD = "login-bench-password"
+
+
+def ensure_player():
+    Player.__table__.create(get_engine(), checkfirst=True)
+    with SessionLocal() as session:
+        if session.scalar(select(Player.id).where(Player.email == EMAIL)):
+            return
+        session.add(
+            Player(
+                id="loginbench",
+                username="loginbench",
+                email=EMAIL,
+                password=passwords.generate_password_hash(PASSWORD),
+            )
+        )
+        session.commit()
+
+
+def run_level(app, threads, requests):
+    remaining = iter(range(requests))
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+    results = []
+
+    def worker():
+        client = app.test_client()
+        barrier.wait()
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            start = time.perf_counter()
+            response = client.post(
+                "/login", json={"email": EMAIL, "password": PASSWORD}
+            )
+            results.append((time.perf_counter() - start, response.status_code))
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    ok = sorted(seconds for seconds, status in results if status == 200)
+    shed = sum(1 for _, status in results if status == 503)
+    p95 = ok[max(0, int(len(ok) * 0.95) - 1)] * 1000 if ok else float("nan")
+    return len(ok) / elapsed, p95, shed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login throughput benchmark")
+    parser.add_argument("--levels", default="1,4,16,64")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--modes", default="pool,inline")
+    args = parser.parse_args()
+
+    ensure_player()
+    app = create_app({"PRELOAD_SPECIES": False})
+    pooled = players.check_password_hash
+
+    print(
+        f"bcrypt rounds={passwords.BCRYPT_LOG_ROUNDS} "
+        f"workers={passwords.HASH_WORKERS} queue={passwords.HASH_QUEUE_LIMIT}"
+    )
+    print(f"{'mode':<8}{'threads':>8}{'logins/s':>10}{'p95 ms':>9}{'503s':>7}")
+    for mode in args.modes.split(","):
+        # inline: bcrypt en el hilo de la petición, como antes del pool
+        players.check_password_hash = pooled if mode == "pool" else passwords._check
+        for level in (int(level) for level in args.levels.split(",")):
+            throughput, p95, shed = run_level(app, level, args.requests)
+            print(f"{mode:<8}{level:>8}{throughput:>10.1f}{p95:>9.1f}{shed:>7}")
+    players.check_password_hash = pooled
+
+
+if __name__ == "__main__":
+    main()
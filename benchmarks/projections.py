@@ -0,0 +1,194 @@
+# Proyecciones de columnas contra entidades ORM completas en las lecturas,
+# contra la base de DB_URL (MySQL, ver benchmarks/load.py):
+#
+#   python benchmarks/projections.py [--pokemon 5000] [--repeat 10]
+#
+#   collection  session.query(PokemonOwned) (versión anterior) contra
+#               session.query(*OWNED_COLUMNS) de /pokemon/users_pokemon,
+#               más el dict por fila que arma la ruta
+#   exists      cargar el Player receptor (versión anterior de send_request)
+#               contra la consulta EXISTS actual
+#
+# Para cada variante reporta el mejor tiempo, los bytes asignados por fila
+# (pico de tracemalloc) y la relación con la versión anterior. Crea un
+# jugador temporal con --pokemon pokemon y lo borra al final. Con
+# DB_URL=sqlite:///... también corre (config/sqlite.py; crea las tablas que
+# usa), útil para comparar el costo del ORM sin un servidor.
+import argparse
+import datetime
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sqlalchemy import delete, insert, select  # noqa: E402
+
+from config.db import SessionLocal, get_engine  # noqa: E402
+from helpers import bulk_load  # noqa: E402
+from helpers.ids import sortable_ids  # noqa: E402
+from models.models import Base, Player, PokemonOwned, PokemonStat  # noqa: E402
+from routes.pokemon_owned import OWNED_COLUMNS  # noqa: E402
+
+PLAYER_ID = "projbench"
+SQLITE_TABLES = ("player", "pokemon_stat", "pokemon_owned")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Row projections vs entities")
+    parser.add_argument("--pokemon", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=10)
+    return parser.parse_args()
+
+
+def to_json(data):
+    return {
+        "id": data.id,
+        "player_id": data.player_id,
+        "pokedex_number": data.pokedex_number,
+        "in_team": data.in_team,
+        "obtained_at": data.obtained_at,
+        "mote": data.mote,
+    }
+
+
+def entities():
+    session = SessionLocal()
+    try:
+        pokemon = (
+            session.query(PokemonOwned)
+            .filter(PokemonOwned.player_id == PLAYER_ID)
+            .order_by(PokemonOwned.obtained_at, PokemonOwned.id)
+            .all()
+        )
+        return [to_json(owned) for owned in pokemon]
+    finally:
+        session.close()
+
+
+def columns():
+    session = SessionLocal()
+    try:
+        rows = (
+            session.query(*OWNED_COLUMNS)
+            .filter(PokemonOwned.player_id == PLAYER_ID)
+            .order_by(PokemonOwned.obtained_at, PokemonOwned.id)
+            .all()
+        )
+        return [to_json(row) for row in rows]
+    finally:
+        session.close()
+
+
+def load_player(session):
+    found = session.query(Player).filter(Player.id == PLAYER_ID).first() is not None
+    session.expunge_all()
+    return found
+
+
+def player_exists(session):
+    return session.query(
+        session.query(Player.id).filter(Player.id == PLAYER_ID).exists()
+    ).scalar()
+
+
+def measure(call, repeat, number=1):
+    seconds = min(timeit.repeat(call, number=number, repeat=repeat)) / number
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def report(title, variants, repeat, rows, number=1, unit="row"):
+    print(title)
+    baseline = None
+    for name, call in variants:
+        seconds, peak = measure(call, repeat, number)
+        baseline = baseline or seconds
+        print(
+            f"  {name:>9}: {seconds * 1000:8.3f} ms  "
+            f"{peak / rows:9,.0f} B/{unit} peak  x{baseline / seconds:.2f}"
+        )
+
+
+def seed(session, count):
+    engine = get_engine()
+    if engine.dialect.name == "sqlite":
+        tables = [Base.metadata.tables[name] for name in SQLITE_TABLES]
+        Base.metadata.create_all(engine, tables=tables)
+        if session.scalar(select(PokemonStat.pokedex_number).limit(1)) is None:
+            session.execute(
+                insert(PokemonStat), bulk_load.synthetic_species(random.Random(0))
+            )
+
+    numbers = session.scalars(select(PokemonStat.pokedex_number).limit(151)).all()
+    if not numbers:
+        sys.exit("pokemon_stat is empty: load species first (bulk_load.py species)")
+
+    session.add(
+        Player(
+            id=PLAYER_ID,
+            username=PLAYER_ID,
+            email=f"{PLAYER_ID}@example.com",
+            password="-",
+        )
+    )
+    session.flush()
+    today = datetime.date.today()
+    session.execute(
+        insert(PokemonOwned),
+        [
+            {
+                "id": owned_id,
+                "player_id": PLAYER_ID,
+                "pokedex_number": numbers[i % len(numbers)],
+                "in_team": 0,
+                "obtained_at": today - datetime.timedelta(days=i % 365),
+            }
+            for i, owned_id in enumerate(sortable_ids(count, 24))
+        ],
+    )
+    session.commit()
+
+
+def main():
+    args = parse_args()
+    session = SessionLocal()
+    try:
+        seed(session, args.pokemon)
+        assert entities() == columns()
+
+        report(
+            f"collection ({args.pokemon} pokemon)",
+            [("entities", entities), ("columns", columns)],
+            args.repeat,
+            args.pokemon,
+        )
+        report(
+            "receiver check (per call)",
+            [
+                ("load", lambda: load_player(session)),
+                ("exists", lambda: player_exists(session)),
+            ],
+            args.repeat,
+            1,
+            number=200,
+            unit="call",
+        )
+    finally:
+        session.rollback()
+        session.execute(
+            delete(PokemonOwned).where(PokemonOwned.player_id == PLAYER_ID)
+        )
+        session.execute(delete(Player).where(Player.id == PLAYER_ID))
+        session.commit()
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
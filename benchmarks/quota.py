@@ -0,0 +1,175 @@
+# Cuota diaria de pokeballs bajo capturas simultáneas del mismo jugador,
+# contra la base de DB_URL (MySQL; ver benchmarks/load.py):
+#
+#   python benchmarks/quota.py [--limit 10] [--requests 50] [--threads 16]
+#
+# Crea un jugador temporal y lanza todas las peticiones a la vez (una
+# barrera suelta los hilos juntos), primero a GET /capture_pokemon y luego,
+# con el contador reiniciado a un día anterior, a POST /capture_pokemon/batch
+# con lotes de 3. En cada fase verifica que se aceptaron exactamente las
+# pokeballs que permite el límite, que el resto recibió 429 y que
+# pokemon_owned, pokeball_history y el contador del jugador coinciden.
+# Termina con código 1 si algo no cuadra y borra el jugador al final.
+import argparse
+import datetime
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BATCH = 3
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Concurrent pokeball quota check")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=16)
+    return parser.parse_args()
+
+
+def fire(app, requests, threads, send):
+    barrier = threading.Barrier(threads)
+    remaining = iter(range(requests))
+    lock = threading.Lock()
+    statuses = []
+
+    def worker():
+        client = app.test_client()
+        barrier.wait()
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            statuses.append(send(client).status_code)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for worker_thread in workers:
+        worker_thread.start()
+    for worker_thread in workers:
+        worker_thread.join()
+    return statuses
+
+
+def main():
+    args = parse_args()
+    # La cuota se lee del entorno al importar las rutas
+    os.environ["POKEBALLS_PER_DAY"] = str(args.limit)
+
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import delete, func, select, update
+
+    from app import create_app
+    from config.db import SessionLocal
+    from helpers.ids import random_id
+    from models.models import Player, PokeballHistory, PokemonOwned
+
+    app = create_app()
+    player_id = f"quota{random_id(10)}"
+    session = SessionLocal()
+    session.add(
+        Player(
+            id=player_id,
+            username=player_id[:20],
+            email=f"{player_id}@example.com",
+            password="-",
+        )
+    )
+    session.commit()
+
+    with app.app_context():
+        headers = {"Authorization": f"Bearer {create_access_token(identity=player_id)}"}
+
+    def counts():
+        session.expire_all()
+        return (
+            session.scalar(
+                select(Player.pokeballs_opened).where(Player.id == player_id)
+            ),
+            session.scalar(
+                select(func.count())
+                .select_from(PokemonOwned)
+                .where(PokemonOwned.player_id == player_id)
+            ),
+            session.scalar(
+                select(func.count())
+                .select_from(PokeballHistory)
+                .where(PokeballHistory.user_id == player_id)
+            ),
+        )
+
+    failures = []
+
+    def check(phase, statuses, per_request, before):
+        accepted = statuses.count(201)
+        rejected = statuses.count(429)
+        expected = args.limit // per_request
+        opened, owned, history = counts()
+        print(
+            f"{phase}: {accepted} accepted, {rejected} rejected, "
+            f"{len(statuses) - accepted - rejected} other; counter={opened} "
+            f"owned={owned - before[1]} history={history - before[2]}"
+        )
+        if accepted != min(expected, len(statuses)):
+            failures.append(f"{phase}: expected {expected} accepted, got {accepted}")
+        if accepted + rejected != len(statuses):
+            failures.append(f"{phase}: unexpected status codes {set(statuses)}")
+        captured = accepted * per_request
+        if (opened, owned - before[1], history - before[2]) != (captured,) * 3:
+            failures.append(f"{phase}: counter and rows disagree")
+
+    try:
+        before = counts()
+        started = time.perf_counter()
+        statuses = fire(
+            app,
+            args.requests,
+            args.threads,
+            lambda client: client.get("/capture_pokemon", headers=headers),
+        )
+        check("single", statuses, 1, before)
+
+        # Simular el día siguiente para la fase de lotes
+        yesterday = datetime.date.today() - datetime.timedelta(days=1)
+        session.execute(
+            update(Player)
+            .where(Player.id == player_id)
+            .values(last_opened=yesterday, pokeballs_opened=args.limit)
+        )
+        session.commit()
+
+        before = counts()
+        before = (0, before[1], before[2])
+        statuses = fire(
+            app,
+            args.requests,
+            args.threads,
+            lambda client: client.post(
+                "/capture_pokemon/batch", headers=headers, json={"count": BATCH}
+            ),
+        )
+        check("batch", statuses, BATCH, before)
+        print(f"elapsed: {time.perf_counter() - started:.2f}s")
+    finally:
+        session.rollback()
+        session.execute(
+            delete(PokeballHistory).where(PokeballHistory.user_id == player_id)
+        )
+        session.execute(
+            delete(PokemonOwned).where(PokemonOwned.player_id == player_id)
+        )
+        session.execute(delete(Player).where(Player.id == player_id))
+        session.commit()
+        session.close()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Sorteo ponderado: lista de boletos (la antigua choose_capture_rate) contra
+# WeightedSampler. Armar el sampler en cada sorteo es más lento que la lista
+# de boletos; la ganancia está en reusar la tabla (CaptureSampler).
+#
+#   python benchmarks/sampler.py [--draws 100000]
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helpers.helpers import WeightedSampler  # noqa: E402
+
+# Especies por capture_rate en un pokemon_stat completo (aprox.)
+WEIGHTS = {
+    3: 60,
+    25: 10,
+    30: 20,
+    45: 350,
+    60: 30,
+    75: 40,
+    90: 60,
+    120: 50,
+    127: 10,
+    150: 10,
+    190: 70,
+    200: 5,
+    225: 5,
+    235: 5,
+    255: 70,
+}
+
+
+def ticket_list(capture_rates):
+    tickets = []
+    for key, value in capture_rates.items():
+        tickets.extend([key] * value)
+
+    return random.choice(tickets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Weighted sampler benchmark")
+    parser.add_argument("--draws", type=int, default=100_000)
+    args = parser.parse_args()
+
+    sampler = WeightedSampler(WEIGHTS)
+    cases = (
+        ("ticket list", lambda: ticket_list(WEIGHTS)),
+        ("WeightedSampler build + draw", lambda: WeightedSampler(WEIGHTS).draw()),
+        ("WeightedSampler.draw", sampler.draw),
+    )
+    for name, fn in cases:
+        seconds = timeit.timeit(fn, number=args.draws)
+        print(f"{name:<30} {seconds / args.draws * 1e6:8.2f} us/draw")
+
+    seconds = timeit.timeit(lambda: sampler.sample(args.draws), number=1)
+    name = "WeightedSampler.sample(k)"
+    print(f"{name:<30} {seconds / args.draws * 1e6:8.2f} us/draw")
+
+
+if __name__ == "__main__":
+    main()
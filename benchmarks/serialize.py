@@ -0,0 +1,123 @@
+# Serialización de una colección grande (GET /pokemon/users_pokemon), en
+# memoria y sin base de datos:
+#
+#   python benchmarks/serialize.py [--pokemon 5000] [--repeat 20]
+#
+#   old     entidades PokemonOwned -> dict por fila -> proveedor JSON de Flask
+#   rows    filas de columnas -> dict por fila -> proveedor JSON de Flask
+#   orjson  filas de columnas -> dict por fila -> OrjsonProvider (el actual)
+#
+# Reporta milisegundos por respuesta (armar los dicts y codificar por
+# separado) y bytes del cuerpo, y verifica que las tres variantes produzcan
+# el mismo JSON.
+import argparse
+import datetime
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+from sqlalchemy.engine.result import (  # noqa: E402
+    IteratorResult,
+    SimpleResultMetaData,
+)
+
+from helpers.ids import sortable_ids  # noqa: E402
+from helpers.json_provider import OrjsonProvider, RowJSONProvider, orjson  # noqa: E402
+from models.models import PokemonOwned  # noqa: E402
+from routes.pokemon_owned import OWNED_COLUMNS  # noqa: E402
+
+NAMES = {number: f"species{number}" for number in range(1, 152)}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Collection serialization")
+    parser.add_argument("--pokemon", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    return parser.parse_args()
+
+
+def make_data(count):
+    rng = random.Random(42)
+    today = datetime.date.today()
+    keys = [column.key for column in OWNED_COLUMNS]
+    values = [
+        (
+            owned_id,
+            "player0000001",
+            rng.randrange(1, 152),
+            rng.randrange(2),
+            today - datetime.timedelta(days=rng.randrange(365)),
+            None,
+        )
+        for owned_id in sortable_ids(count, 24)
+    ]
+    entities = [PokemonOwned(**dict(zip(keys, value))) for value in values]
+    # Filas de SQLAlchemy como las de session.query(*OWNED_COLUMNS)
+    rows = IteratorResult(SimpleResultMetaData(keys), iter(values)).all()
+    return entities, rows
+
+
+def to_json(data):
+    return {
+        "name": NAMES[data.pokedex_number],
+        "id": data.id,
+        "player_id": data.player_id,
+        "pokedex_number": data.pokedex_number,
+        "in_team": data.in_team,
+        "obtained_at": data.obtained_at,
+        "mote": data.mote,
+    }
+
+
+def main():
+    args = parse_args()
+    entities, rows = make_data(args.pokemon)
+
+    variants = [
+        ("old", DefaultJSONProvider, entities),
+        ("rows", RowJSONProvider, rows),
+    ]
+    if orjson is not None:
+        variants.append(("orjson", OrjsonProvider, rows))
+    else:
+        print("orjson is not installed: skipping the orjson variant")
+
+    bodies = {}
+    for name, provider_class, data in variants:
+        app = Flask(__name__)
+        app.json = provider_class(app)
+        with app.app_context():
+            payload = [to_json(row) for row in data]
+            bodies[name] = app.json.response(payload).get_data()
+            build = min(
+                timeit.repeat(
+                    lambda: [to_json(row) for row in data],
+                    number=1,
+                    repeat=args.repeat,
+                )
+            )
+            encode = min(
+                timeit.repeat(
+                    lambda: app.json.response(payload).get_data(),
+                    number=1,
+                    repeat=args.repeat,
+                )
+            )
+        print(
+            f"{name:>7}: {(build + encode) * 1000:7.2f} ms/response "
+            f"(dicts {build * 1000:.2f} ms, encode {encode * 1000:.2f} ms, "
+            f"{len(bodies[name]):,} bytes)"
+        )
+
+    parsed = {name: app.json.loads(body) for name, body in bodies.items()}
+    if len({repr(value) for value in parsed.values()}) != 1:
+        sys.exit("FAIL: variants produced different JSON")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# Comparación de los dos modos de servir la app bajo carga HTTP real:
+#
+#   wsgi   gunicorn -c gunicorn.conf.py wsgi:application (workers gthread)
+#   asgi   uvicorn asgi:application (event loop + pool de hilos acotado)
+#
+#   python benchmarks/serving.py [--modes wsgi,asgi] [--levels 10,100,1000]
+#       [--idle 0] [--duration 10] [--workers 2] [--path /pokemon/users_pokemon]
+#       [--player bench0000000]
+#
+# Levanta cada servidor en un puerto local con la misma DB_URL, espera a que
+# responda y, por cada nivel de concurrencia, abre esa cantidad de conexiones
+# keep-alive que piden --path sin pausa durante --duration segundos. Con
+# --idle N además mantiene N conexiones abiertas sin pedir nada (clientes
+# lentos o inactivos). Reporta peticiones por segundo, p50/p95/p99 y errores
+# (status distinto de 200, conexiones rechazadas o cortadas) por modo y nivel.
+#
+# El jugador de --player tiene que existir: sembrar antes con
+# `python benchmarks/load.py --reset`. El token se firma aquí con JWT_SECRET,
+# igual que lo haría /login. Sin CACHE_URL no hay caché de respuestas
+# (helpers/cache.py), así que cada petición llega a la base; con
+# CACHE_URL=redis://... se mide con la caché compartida.
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+HOST = "127.0.0.1"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="WSGI vs ASGI load comparison")
+    parser.add_argument("--modes", default="wsgi,asgi")
+    parser.add_argument("--levels", default="10,100,1000")
+    parser.add_argument("--idle", type=int, default=0)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--path", default="/pokemon/users_pokemon")
+    parser.add_argument("--player", default="bench0000000")
+    return parser.parse_args()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def server_command(mode, port, workers):
+    if mode == "wsgi":
+        return [
+            sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+            "--bind", f"{HOST}:{port}", "--workers", str(workers),
+            "--log-level", "warning", "wsgi:application",
+        ]  # fmt: skip
+    return [
+        sys.executable, "-m", "uvicorn", "asgi:application",
+        "--host", HOST, "--port", str(port), "--workers", str(workers),
+        "--no-access-log", "--log-level", "warning",
+    ]  # fmt: skip
+
+
+def start_server(mode, port, workers):
+    process = subprocess.Popen(server_command(mode, port, workers), cwd=ROOT)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit(f"{mode} server exited with code {process.returncode}")
+        try:
+            urllib.request.urlopen(f"http://{HOST}:{port}/metrics/pool", timeout=1)
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    sys.exit(f"{mode} server did not start in 30s")
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(port, request, stop_at, latencies, errors):
+    try:
+        reader, writer = await asyncio.open_connection(HOST, port)
+    except OSError:
+        errors.append("connect")
+        return
+    try:
+        while time.monotonic() < stop_at:
+            started = time.perf_counter()
+            writer.write(request)
+            status = await read_response(reader)
+            if status == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors.append(status)
+    except (OSError, asyncio.IncompleteReadError):
+        errors.append("disconnect")
+    finally:
+        writer.close()
+
+
+async def idle_client(port, stop_at, opened):
+    try:
+        _, writer = await asyncio.open_connection(HOST, port)
+    except OSError:
+        return
+    opened.append(writer)
+    await asyncio.sleep(max(0, stop_at - time.monotonic()))
+    writer.close()
+
+
+async def run_level(port, request, level, idle, duration):
+    stop_at = time.monotonic() + duration
+    latencies, errors, opened = [], [], []
+    idlers = [
+        asyncio.create_task(idle_client(port, stop_at, opened)) for _ in range(idle)
+    ]
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(client(port, request, stop_at, latencies, errors) for _ in range(level))
+    )
+    elapsed = time.perf_counter() - started
+    await asyncio.gather(*idlers)
+    return latencies, errors, len(opened), elapsed
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def token_for(player_id):
+    from flask_jwt_extended import create_access_token
+
+    from app import create_app
+
+    app = create_app({"PRELOAD_SPECIES": False, "METRICS_ENABLED": False})
+    with app.app_context():
+        return create_access_token(identity=player_id)
+
+
+def main():
+    args = parse_args()
+    request = (
+        f"GET {args.path} HTTP/1.1\r\nHost: {HOST}\r\n"
+        f"Authorization: Bearer {token_for(args.player)}\r\n\r\n"
+    ).encode()
+    levels = [int(level) for level in args.levels.split(",")]
+
+    print(
+        f"{'mode':>5} {'clients':>8} {'idle':>6} {'req/s':>9} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+    )
+    for mode in args.modes.split(","):
+        port = free_port()
+        process = start_server(mode, port, args.workers)
+        try:
+            for level in levels:
+                latencies, errors, idle, elapsed = asyncio.run(
+                    run_level(port, request, level, args.idle, args.duration)
+                )
+                latencies.sort()
+                print(
+                    f"{mode:>5} {level:>8} {idle:>6} "
+                    f"{len(latencies) / elapsed:>9,.0f} "
+                    f"{percentile(latencies, 0.50) * 1000:>8.1f} "
+                    f"{percentile(latencies, 0.95) * 1000:>8.1f} "
+                    f"{percentile(latencies, 0.99) * 1000:>8.1f} "
+                    f"{len(errors):>7}",
+                    flush=True,
+                )
+        finally:
+            stop_server(process)
+
+
+if __name__ == "__main__":
+    main()
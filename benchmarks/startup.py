@@ -0,0 +1,118 @@
+# Tiempo de arranque en frío:
+#
+#   python benchmarks/startup.py            imprime los resultados
+#   python benchmarks/startup.py --record   además los agrega al historial
+#
+# Mide, cada uno en un proceso nuevo:
+#   - import_ms: tiempo acumulado de `import app` según `python -X importtime`
+#   - create_app_ms: import + create_app()
+#   - first_response_ms: import + create_app() + primera respuesta de
+#     GET /metrics/pool (no consulta la base)
+# y guarda el top de módulos más lentos de importar.
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY = os.path.join(ROOT, "benchmarks", "startup_history.jsonl")
+
+FIRST_RESPONSE = """
+import time
+start = time.perf_counter()
+from app import create_app
+app = create_app({"PRELOAD_SPECIES": %(preload)s})
+created = time.perf_counter()
+response = app.test_client().get("/metrics/pool")
+done = time.perf_counter()
+assert response.status_code == 200, response.status_code
+print((created - start) * 1000, (done - start) * 1000)
+"""
+
+
+def _run(args):
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+
+def measure_imports(top):
+    result = _run(["-X", "importtime", "-c", "import app"])
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        # La sangría del nombre indica la profundidad; el primer nivel lleva
+        # un solo espacio
+        top_level = not name[1:].startswith(" ")
+        modules.append((int(cumulative), name.strip(), top_level))
+
+    app_total = next(us for us, name, _ in modules if name == "app")
+    slowest = sorted(
+        ((us, name) for us, name, top_level in modules if top_level), reverse=True
+    )[:top]
+    return app_total / 1000, [{"module": n, "ms": us / 1000} for us, n in slowest]
+
+
+def measure_first_response(preload):
+    result = _run(["-c", FIRST_RESPONSE % {"preload": preload}])
+    create_app_ms, first_response_ms = map(float, result.stdout.split())
+    return create_app_ms, first_response_ms
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--no-preload", action="store_true")
+    parser.add_argument("--record", action="store_true")
+    args = parser.parse_args()
+
+    import_runs, create_runs, response_runs = [], [], []
+    slowest = []
+    for _ in range(args.runs):
+        import_ms, slowest = measure_imports(args.top)
+        create_app_ms, first_response_ms = measure_first_response(
+            not args.no_preload
+        )
+        import_runs.append(import_ms)
+        create_runs.append(create_app_ms)
+        response_runs.append(first_response_ms)
+
+    result = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "import_ms": min(import_runs),
+        "create_app_ms": min(create_runs),
+        "first_response_ms": min(response_runs),
+        "slowest_imports": slowest,
+    }
+    print(json.dumps(result, indent=2))
+
+    if args.record:
+        with open(HISTORY, "a") as history:
+            history.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# Carga masiva de datos (ver helpers/bulk_load.py):
+#
+#   python bulk_load.py species pokemon.csv
+#       especies canónicas en pokemon_stat; se puede repetir sin duplicar
+#
+#   python bulk_load.py load pokemon_owned owned.parquet [--skip-checks]
+#   python bulk_load.py load player players.csv --load-data
+#       CSV o Parquet con las columnas de la tabla; --load-data usa
+#       LOAD DATA LOCAL INFILE (solo CSV, el servidor necesita local_infile)
+#
+#   python bulk_load.py generate --players 200000 --friends 20 --pokemon 25
+#   python bulk_load.py generate --players 200000 --out data/
+#       datos sintéticos directo a la base o a un CSV por tabla en --out
+#
+# Cada carga reporta filas y filas por segundo. La URL de la base sale de
+# DB_URL, igual que la app.
+import argparse
+import os
+import random
+import sys
+import time
+
+from sqlalchemy import select
+
+from helpers import bulk_load
+from models.models import PokemonStat
+
+
+def _print(result):
+    print(result, flush=True)
+
+
+def cmd_species(args):
+    species = bulk_load.read_species_csv(args.path)
+    _print(bulk_load.upsert_species(species, args.batch_size))
+
+
+def cmd_load(args):
+    table = bulk_load.get_table(args.table)
+    if args.load_data:
+        if args.path.endswith(".parquet"):
+            sys.exit("--load-data only works with CSV files")
+        _print(bulk_load.load_data_infile(table, args.path))
+        return
+
+    batches = bulk_load.read_file(args.path, table, args.batch_size)
+    _print(bulk_load.bulk_insert(table, batches, skip_checks=args.skip_checks))
+
+
+def _species_numbers(args, rng):
+    if args.synthetic_species:
+        species = bulk_load.synthetic_species(rng)
+        if args.out:
+            path = os.path.join(args.out, "pokemon_stat.csv")
+            bulk_load.write_csv(path, [species])
+        else:
+            _print(bulk_load.upsert_species(species, args.batch_size))
+        return [row["pokedex_number"] for row in species]
+
+    from config.db import SessionLocal
+
+    session = SessionLocal()
+    try:
+        numbers = session.scalars(select(PokemonStat.pokedex_number)).all()
+    finally:
+        session.close()
+    if not numbers:
+        sys.exit("pokemon_stat is empty: load species first or use --synthetic-species")
+    return numbers
+
+
+def cmd_generate(args):
+    from helpers.passwords import generate_password_hash
+
+    rng = random.Random(args.seed)
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+
+    started = time.perf_counter()
+    species = _species_numbers(args, rng)
+    # Un solo hash para todos los jugadores: bcrypt por fila tardaría horas
+    password_hash = generate_password_hash(args.password)
+    pairs = bulk_load.friend_pairs(args.players, args.friends, rng)
+    owned_sample = {}
+
+    tables = (
+        (
+            "player",
+            bulk_load.generate_players(
+                args.players, password_hash, args.prefix, args.batch_size
+            ),
+        ),
+        ("friend", bulk_load.generate_friends(pairs, args.prefix, args.batch_size)),
+        (
+            "pokemon_owned",
+            bulk_load.generate_pokemon(
+                args.players,
+                args.pokemon,
+                species,
+                rng,
+                args.prefix,
+                sample=owned_sample,
+                batch_size=args.batch_size,
+            ),
+        ),
+    )
+    total = 0
+    for name, batches in tables:
+        total += _generate(args, name, batches)
+
+    # Los trades usan los pokemon generados arriba
+    trades = bulk_load.generate_trades(
+        pairs,
+        int(args.trades * args.players),
+        owned_sample,
+        rng,
+        args.prefix,
+        args.batch_size,
+    )
+    total += _generate(args, "trade", trades)
+
+    elapsed = time.perf_counter() - started
+    print(f"total: {total} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+
+
+def _generate(args, name, batches):
+    if args.out:
+        started = time.perf_counter()
+        rows = bulk_load.write_csv(os.path.join(args.out, f"{name}.csv"), batches)
+        _print(bulk_load.LoadResult(name, rows, time.perf_counter() - started))
+        return rows
+
+    result = bulk_load.bulk_insert(
+        bulk_load.get_table(name), batches, skip_checks=args.skip_checks
+    )
+    _print(result)
+    return result.rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk loader for Pocket Rivals")
+    parser.add_argument("--batch-size", type=int, default=bulk_load.BATCH_SIZE)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    species = commands.add_parser("species", help="upsert the species dataset")
+    species.add_argument("path")
+    species.set_defaults(run=cmd_species)
+
+    load = commands.add_parser("load", help="load a CSV or Parquet file")
+    load.add_argument("table", choices=bulk_load.TABLES)
+    load.add_argument("path")
+    load.add_argument("--load-data", action="store_true")
+    load.add_argument("--skip-checks", action="store_true")
+    load.set_defaults(run=cmd_load)
+
+    generate = commands.add_parser("generate", help="generate synthetic data")
+    generate.add_argument("--players", type=int, default=100000)
+    generate.add_argument("--friends", type=float, default=10, help="mean degree")
+    generate.add_argument("--pokemon", type=int, default=20, help="per player")
+    generate.add_argument("--trades", type=float, default=0.5, help="per player")
+    generate.add_argument("--prefix", default="gen", help="player id prefix")
+    generate.add_argument("--password", default="password")
+    generate.add_argument("--seed", type=int, default=42)
+    generate.add_argument("--synthetic-species", action="store_true")
+    generate.add_argument("--skip-checks", action="store_true")
+    generate.add_argument("--out", help="write CSV files here instead of loading")
+    generate.set_defaults(run=cmd_generate)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,156 @@
 import os
+import threading
+import time
+from flask import g
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
 
+from config.settings import DatabaseSettings
 from models.models import Base
 
 
-load_dotenv()
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        # Funciones que reciben cada espera (p. ej. para atribuirla a la petición)
+        self.listeners = []
 
-engine = create_engine(
-    os.getenv("DB_URL"),
-    echo=True,
-    pool_size=2,
-    max_overflow=0,
-    pool_recycle=3600,
-    pool_pre_ping=True,
-)
+    def record_wait(self, seconds):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            if seconds > self.wait_max:
+                self.wait_max = seconds
+        for listener in self.listeners:
+            listener(seconds)
 
-SessionLocal = sessionmaker(bind=engine)
+
+pool_metrics = PoolMetrics()
+
+
+# QueuePool que mide cuánto espera cada checkout por una conexión libre
+class TimedQueuePool(QueuePool):
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - start)
+
+
+db_settings = DatabaseSettings.from_env()
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+# El engine se crea en el primer uso y no al importar el módulo. Con
+# DB_URL=sqlite:///... se aplican los ajustes de config/sqlite.py
+def get_engine():
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                options = db_settings.engine_options()
+                sqlite = (db_settings.url or "").startswith("sqlite")
+                if sqlite:
+                    from config import sqlite as sqlite_compat
+
+                    options.update(sqlite_compat.engine_options())
+                _engine = create_engine(
+                    db_settings.url, poolclass=TimedQueuePool, **options
+                )
+                if sqlite:
+                    sqlite_compat.install(_engine)
+    return _engine
+
+
+# Después de un fork: el worker arranca con el pool vacío sin cerrar las
+# conexiones que siguen siendo del proceso padre
+def dispose_engine():
+    if _engine is not None:
+        _engine.dispose(close=False)
+
+
+class _LazySessionmaker(sessionmaker):
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionmaker()
+
+
+# Sesión de la petición actual; se abre en el primer uso y se libera en el
+# teardown, así que las peticiones que no tocan la base no piden conexión
+def get_session():
+    session = g.get("db")
+    if session is None:
+        session = g.db = SessionLocal()
+    return session
+
+
+def close_session(exc=None):
+    session = g.pop("db", None)
+    if session is None:
+        return
+    try:
+        if exc is not None:
+            session.rollback()
+    finally:
+        session.close()
+
+
+def get_pool_metrics():
+    pool = get_engine().pool
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": db_settings.max_overflow,
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checkouts": pool_metrics.checkouts,
+        "checkout_wait_seconds_total": pool_metrics.wait_total,
+        "checkout_wait_seconds_max": pool_metrics.wait_max,
+    }
+
+
+# Última revisión de migrations/versions; actualizar junto con cada migración
+SCHEMA_VERSION = "0003"
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+# Solo para desarrollo y pruebas; en producción el esquema lo maneja Alembic
+def create_schema():
+    Base.metadata.create_all(bind=get_engine())
+
+
+# Arranque rápido: en lugar de reflejar tablas, una sola consulta al sello
+# de versión que deja Alembic
+def check_schema_version():
+    try:
+        with get_engine().connect() as connection:
+            current = connection.execute(
+                text("SELECT version_num FROM alembic_version")
+            ).scalar()
+    except SQLAlchemyError as e:
+        raise SchemaVersionError(f"Could not read schema version: {e}") from e
+
+    if current != SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"Database schema is at {current}, expected {SCHEMA_VERSION}; "
+            "run `alembic upgrade head`"
+        )
 
 
 def init_db(app):
     app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET")
-    Base.metadata.create_all(bind=engine)
+    app.teardown_appcontext(close_session)
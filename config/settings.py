@@ -0,0 +1,56 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from dotenv import load_dotenv
+
+# Única carga del .env; todo lo que lee variables de entorno importa este
+# módulo (directo o por config.db) antes de leerlas
+load_dotenv()
+
+
+def _env_bool(name, default):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+@dataclass(frozen=True)
+class DatabaseSettings:
+    url: Optional[str]
+    pool_size: int = 10
+    max_overflow: int = 5
+    pool_timeout: int = 30
+    pool_recycle: int = 3600
+    pool_pre_ping: bool = True
+    echo: bool = False
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            url=os.getenv("DB_URL"),
+            pool_size=_env_int("DB_POOL_SIZE", cls.pool_size),
+            max_overflow=_env_int("DB_MAX_OVERFLOW", cls.max_overflow),
+            pool_timeout=_env_int("DB_POOL_TIMEOUT", cls.pool_timeout),
+            pool_recycle=_env_int("DB_POOL_RECYCLE", cls.pool_recycle),
+            pool_pre_ping=_env_bool("DB_POOL_PRE_PING", cls.pool_pre_ping),
+            echo=_env_bool("DB_ECHO", cls.echo),
+        )
+
+    def engine_options(self):
+        return {
+            "echo": self.echo,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+        }
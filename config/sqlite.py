@@ -0,0 +1,29 @@
+# SQLite como sustituto de MySQL para pruebas y benchmarks sin servidor
+# (DB_URL=sqlite:///...): TINYINT se crea como INTEGER y LEAST/GREATEST (las
+# columnas calculadas de friend y friendship_key) se registran como funciones
+# en cada conexión. Los bloqueos FOR UPDATE no existen en SQLite y los UPDATE
+# evalúan todas las asignaciones con la fila vieja, así que la concurrencia y
+# la semántica de MySQL solo se prueban contra MySQL.
+from sqlalchemy import event
+from sqlalchemy.dialects.mysql import TINYINT
+from sqlalchemy.ext.compiler import compiles
+
+
+@compiles(TINYINT, "sqlite")
+def _tinyint(type_, compiler, **kw):
+    return "INTEGER"
+
+
+def _register_functions(dbapi_connection, connection_record):
+    dbapi_connection.create_function("least", 2, min, deterministic=True)
+    dbapi_connection.create_function("greatest", 2, max, deterministic=True)
+
+
+# Las conexiones del pool se usan desde varios hilos (workers gthread, hilos
+# de los benchmarks), no solo desde el que las abrió
+def engine_options():
+    return {"connect_args": {"check_same_thread": False}}
+
+
+def install(engine):
+    event.listen(engine, "connect", _register_functions)
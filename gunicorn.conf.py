@@ -0,0 +1,89 @@
+# Perfil de arranque para gunicorn con workers gthread:
+#
+#   gunicorn -c gunicorn.conf.py wsgi:application
+#
+# Cada worker es un proceso con su propio pool de conexiones, así que el
+# tamaño del pool se define por worker. Con el worker gthread cada hilo puede
+# tener una sesión abierta a la vez, por eso por defecto
+#
+#   GUNICORN_THREADS = DB_POOL_SIZE + DB_MAX_OVERFLOW
+#
+# y el número de workers sale de los CPUs (2 * CPUs + 1), recortado para que
+# WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW) no pase de
+# DB_MAX_CONNECTIONS si está definido (el max_connections que le toca a esta
+# instancia en MySQL). WEB_CONCURRENCY y GUNICORN_THREADS fijan los valores
+# a mano. Ejemplo para una instancia con 100 conexiones disponibles:
+#
+#   DB_MAX_CONNECTIONS=100 DB_POOL_SIZE=8 DB_MAX_OVERFLOW=2
+#
+# Con más de un worker la caché de respuestas tiene que ser compartida
+# (CACHE_URL=redis://...); CACHE_URL=local es solo para un único proceso.
+#
+# Variables del pool (ver config/settings.py):
+#   DB_POOL_SIZE       conexiones persistentes por worker (default 10)
+#   DB_MAX_OVERFLOW    conexiones extra temporales por worker (default 5)
+#   DB_POOL_TIMEOUT    segundos de espera por una conexión libre (default 30)
+#   DB_POOL_RECYCLE    segundos antes de reciclar una conexión (default 3600)
+#   DB_POOL_PRE_PING   validar la conexión al hacer checkout (default true)
+#   DB_ECHO            imprimir cada sentencia SQL (default false)
+#
+# La espera de checkout y las conexiones en uso se ven en GET /metrics/pool.
+#
+# Recarga sin cortar conexiones: `kill -HUP <pid del maestro>` levanta workers
+# nuevos con el código actual y deja que los viejos terminen sus peticiones
+# durante graceful_timeout.
+import multiprocessing
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config.settings import DatabaseSettings  # noqa: E402
+
+_db = DatabaseSettings.from_env()
+_connections_per_worker = _db.pool_size + _db.max_overflow
+
+
+def _default_workers():
+    workers = multiprocessing.cpu_count() * 2 + 1
+    max_connections = int(os.getenv("DB_MAX_CONNECTIONS", "0"))
+    if max_connections:
+        workers = min(workers, max_connections // _connections_per_worker)
+    return max(workers, 1)
+
+
+bind = os.getenv("BIND", "0.0.0.0:5000")
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", str(_default_workers())))
+threads = int(os.getenv("GUNICORN_THREADS", str(_connections_per_worker)))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Reemplazar workers de a poco para acotar fugas de memoria
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+
+
+# El maestro valida una sola vez, antes de levantar workers, que la base esté
+# en la revisión de Alembic que espera el código (DB_SCHEMA_MODE=check, por
+# defecto). Las migraciones se aplican aparte con `alembic upgrade head`.
+def on_starting(server):
+    schema_mode = os.getenv("DB_SCHEMA_MODE", "check")
+    if schema_mode == "skip":
+        return
+
+    from config.db import check_schema_version, create_schema
+
+    if schema_mode == "create":
+        create_schema()
+    else:
+        check_schema_version()
+
+
+# Las conexiones abiertas antes del fork no se comparten: cada worker arranca
+# con el pool vacío y abre las suyas
+def post_fork(server, worker):
+    from config.db import dispose_engine
+
+    dispose_engine()
@@ -0,0 +1,70 @@
+import hashlib
+import os
+import time
+
+from flask_jwt_extended import JWTManager
+from sqlalchemy import select
+
+from helpers.cache import LocalCache
+from models.models import Player
+
+JWT_CACHE_TTL = float(os.getenv("JWT_CACHE_TTL", "60"))
+JWT_CACHE_MAX_ENTRIES = int(os.getenv("JWT_CACHE_MAX_ENTRIES", "10000"))
+PLAYER_CACHE_MAX_ENTRIES = int(os.getenv("PLAYER_CACHE_MAX_ENTRIES", "50000"))
+
+
+# Guarda los claims ya verificados por digest del token: un mismo token
+# repetido se salta la verificación de firma hasta JWT_CACHE_TTL segundos,
+# nunca más allá de su `exp`
+class CachedJWTManager(JWTManager):
+    def __init__(
+        self, app=None, ttl=JWT_CACHE_TTL, max_entries=JWT_CACHE_MAX_ENTRIES
+    ):
+        self.claims_ttl = ttl
+        self._claims = LocalCache(max_entries)
+        super().__init__(app)
+
+    def _decode_jwt_from_config(
+        self, encoded_token, csrf_value=None, allow_expired=False
+    ):
+        if csrf_value is not None or allow_expired or self.claims_ttl <= 0:
+            return super()._decode_jwt_from_config(
+                encoded_token, csrf_value, allow_expired
+            )
+
+        key = hashlib.sha256(encoded_token.encode()).digest()
+        claims = self._claims.get(key)
+        if claims is not None and claims.get("exp", float("inf")) > time.time():
+            return dict(claims)
+
+        claims = super()._decode_jwt_from_config(encoded_token)
+        ttl = self.claims_ttl
+        if "exp" in claims:
+            ttl = min(ttl, claims["exp"] - time.time())
+        if ttl > 0:
+            self._claims.set(key, dict(claims), ttl)
+        return claims
+
+
+# IDs de jugadores que ya se sabe que existen. Solo se guardan aciertos, así
+# que un jugador nuevo se encuentra en la base en su primera consulta.
+_known_players = LocalCache(PLAYER_CACHE_MAX_ENTRIES)
+
+
+def player_exists(session, player_id):
+    if _known_players.get(player_id):
+        return True
+
+    exists = (
+        session.execute(select(Player.id).where(Player.id == player_id)).first()
+        is not None
+    )
+    if exists:
+        _known_players.set(player_id, True)
+    return exists
+
+
+# Llamar al borrar un jugador o cambiarle el id. Al crearlo no hace falta:
+# los ids que no existen nunca entran en la caché.
+def forget_player(player_id):
+    _known_players.delete(player_id)
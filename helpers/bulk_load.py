@@ -0,0 +1,390 @@
+import csv
+import datetime
+import os
+import re
+import time
+
+from sqlalchemy import Date, DateTime, Enum, Integer, create_engine, insert, text
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.pool import NullPool
+
+from config.db import SessionLocal, db_settings, get_engine
+from helpers.ids import sortable_ids, uuid7s
+from models.models import Base, TradeStatus
+
+BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "10000"))
+
+# Orden de carga que respeta las llaves foráneas
+TABLES = (
+    "pokemon_stat",
+    "player",
+    "friend",
+    "pokemon_owned",
+    "trade",
+    "pokeball_history",
+)
+
+
+def get_table(name):
+    table = Base.metadata.tables.get(name)
+    if table is None:
+        raise ValueError(f"Unknown table {name!r}, expected one of: {TABLES}")
+    return table
+
+
+# Columnas que se pueden insertar (id_min/id_max de friend las calcula MySQL)
+def insertable_columns(table):
+    return [column for column in table.columns if column.computed is None]
+
+
+def _check_columns(table, names):
+    allowed = {column.name for column in insertable_columns(table)}
+    unknown = sorted(set(names) - allowed)
+    if unknown:
+        raise ValueError(f"Columns not in {table.name}: {', '.join(unknown)}")
+
+
+def _converter(column):
+    column_type = column.type
+    if isinstance(column_type, Enum):
+        return str
+    if isinstance(column_type, DateTime):
+        return datetime.datetime.fromisoformat
+    if isinstance(column_type, Date):
+        return datetime.date.fromisoformat
+    if isinstance(column_type, Integer):
+        return int
+    return str
+
+
+# CSV y Parquet se leen en lotes; los valores vacíos pasan a NULL y el resto
+# se convierte según el tipo de la columna
+def read_csv(path, table, batch_size=BATCH_SIZE):
+    converters = {c.name: _converter(c) for c in insertable_columns(table)}
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        _check_columns(table, reader.fieldnames or ())
+
+        batch = []
+        for record in reader:
+            batch.append(
+                {
+                    key: converters[key](value) if value != "" else None
+                    for key, value in record.items()
+                }
+            )
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def read_parquet(path, table, batch_size=BATCH_SIZE):
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(path)
+    _check_columns(table, parquet.schema_arrow.names)
+
+    for record_batch in parquet.iter_batches(batch_size=batch_size):
+        yield record_batch.to_pylist()
+
+
+def read_file(path, table, batch_size=BATCH_SIZE):
+    if path.endswith(".parquet"):
+        return read_parquet(path, table, batch_size)
+    return read_csv(path, table, batch_size)
+
+
+class LoadResult:
+    def __init__(self, table, rows, seconds):
+        self.table = table
+        self.rows = rows
+        self.seconds = seconds
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.table}: {self.rows} rows in {self.seconds:.1f}s "
+            f"({self.rows_per_second:,.0f} rows/s)"
+        )
+
+
+_SKIP_CHECKS = text("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+_RESTORE_CHECKS = text("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+
+
+# Inserción por lotes con executemany (multi-row VALUES en MySQL), sin pasar
+# por la unidad de trabajo del ORM. Cada lote se confirma por separado para
+# no acumular un undo log enorme. Con skip_checks se desactivan las
+# verificaciones de llaves foráneas y únicas durante la carga (solo para
+# datos que ya se sabe que son consistentes). SET SESSION vale para una
+# conexión, así que toda la carga usa la misma y las verificaciones se
+# restauran en ella antes de devolverla al pool.
+def bulk_insert(table, batches, skip_checks=False, on_batch=None):
+    rows = 0
+    started = time.perf_counter()
+    statement = insert(table)
+    with get_engine().connect() as conn:
+        if skip_checks:
+            conn.execute(_SKIP_CHECKS)
+            conn.commit()
+        try:
+            for batch in batches:
+                if not batch:
+                    continue
+                conn.execute(statement, batch)
+                conn.commit()
+                rows += len(batch)
+                if on_batch is not None:
+                    on_batch(rows)
+        finally:
+            if skip_checks:
+                conn.rollback()
+                conn.execute(_RESTORE_CHECKS)
+                conn.commit()
+    return LoadResult(table.name, rows, time.perf_counter() - started)
+
+
+# LOAD DATA LOCAL INFILE para CSV: lo más rápido en MySQL, pero el servidor
+# necesita local_infile=ON. Las celdas vacías se cargan como NULL. El fin de
+# línea se toma del encabezado: con '\n' a secas un CSV con CRLF dejaría un
+# '\r' pegado a la última columna.
+def load_data_statement(table, path):
+    with open(path, newline="", encoding="utf-8") as f:
+        first_line = f.readline()
+        f.seek(0)
+        header = next(csv.reader(f))
+    _check_columns(table, header)
+    terminator = "\\r\\n" if first_line.endswith("\r\n") else "\\n"
+
+    variables = ", ".join(f"@c{i}" for i in range(len(header)))
+    assignments = ", ".join(
+        f"`{name}` = NULLIF(@c{i}, '')" for i, name in enumerate(header)
+    )
+    return text(
+        f"LOAD DATA LOCAL INFILE :path INTO TABLE `{table.name}` "
+        "CHARACTER SET utf8mb4 "
+        "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+        f"LINES TERMINATED BY '{terminator}' IGNORE 1 LINES "
+        f"({variables}) SET {assignments}"
+    )
+
+
+def load_data_infile(table, path):
+    statement = load_data_statement(table, path)
+
+    engine = create_engine(
+        db_settings.url, connect_args={"local_infile": 1}, poolclass=NullPool
+    )
+    started = time.perf_counter()
+    try:
+        with engine.begin() as conn:
+            rows = conn.execute(statement, {"path": os.path.abspath(path)}).rowcount
+    finally:
+        engine.dispose()
+    return LoadResult(table.name, rows, time.perf_counter() - started)
+
+
+# Dataset de especies (el pokemon.csv de Kaggle u otro con las mismas
+# columnas). La carga es idempotente: INSERT ... ON DUPLICATE KEY UPDATE por
+# pokedex_number, así que se puede repetir para corregir datos.
+SPECIES_COLUMNS = {
+    "pokedex_number": "pokedex_number",
+    "name": "name",
+    "type1": "type1",
+    "type2": "type2",
+    "classification": "classification",
+    "classfication": "classification",
+    "base_total": "base_total",
+    "generation": "generation",
+    "capture_rate": "capture_rate",
+    "is_legendary": "is_legendary",
+}
+_INTEGER = re.compile(r"\d+")
+
+
+def _species_int(value):
+    # Hay valores como "30 (Meteorite)255 (Core)": se toma el primer número
+    match = _INTEGER.search(value or "")
+    return int(match.group()) if match else None
+
+
+def read_species_csv(path):
+    integers = {
+        "pokedex_number",
+        "base_total",
+        "generation",
+        "capture_rate",
+        "is_legendary",
+    }
+    species = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for record in csv.DictReader(f):
+            row = {}
+            for source, column in SPECIES_COLUMNS.items():
+                if source not in record:
+                    continue
+                value = record[source].strip()
+                if column in integers:
+                    row[column] = _species_int(value)
+                else:
+                    row[column] = value or None
+            species.append(row)
+    return species
+
+
+def upsert_species(species, batch_size=BATCH_SIZE):
+    table = get_table("pokemon_stat")
+    rows = 0
+    started = time.perf_counter()
+    session = SessionLocal(autoflush=False)
+    try:
+        for start in range(0, len(species), batch_size):
+            batch = species[start : start + batch_size]
+            statement = mysql_insert(table)
+            statement = statement.on_duplicate_key_update(
+                {
+                    key: statement.inserted[key]
+                    for key in batch[0]
+                    if key != "pokedex_number"
+                }
+            )
+            session.execute(statement, batch)
+            session.commit()
+            rows += len(batch)
+    finally:
+        session.close()
+    return LoadResult(table.name, rows, time.perf_counter() - started)
+
+
+# Generadores de datos sintéticos. Todos producen lotes de dicts listos para
+# bulk_insert y usan el rng que se les pasa, así que una semilla da siempre
+# los mismos datos (salvo los ids aleatorios de pokemon y trades).
+def player_id(prefix, i):
+    return f"{prefix}{i:07d}"
+
+
+def synthetic_species(rng, count=151):
+    return [
+        {
+            "pokedex_number": number,
+            "name": f"species{number}",
+            "type1": "normal",
+            "capture_rate": rng.choice((3, 45, 90, 120, 190, 255)),
+        }
+        for number in range(1, count + 1)
+    ]
+
+
+def generate_players(count, password_hash, prefix, batch_size=BATCH_SIZE):
+    for start in range(0, count, batch_size):
+        yield [
+            {
+                "id": player_id(prefix, i),
+                "username": f"{prefix}{i}"[:20],
+                "email": f"{player_id(prefix, i)}@example.com",
+                "password": password_hash,
+            }
+            for i in range(start, min(count, start + batch_size))
+        ]
+
+
+# Grado por jugador con cola larga (Pareto, alpha 2, media 2) escalado a la
+# media. Cada par suma un amigo a los dos extremos, así que cada jugador
+# sortea la mitad del grado medio; el redondeo al azar evita que truncar baje
+# la media.
+def friend_pairs(players, mean_degree, rng):
+    pairs = set()
+    for i in range(players):
+        wanted = mean_degree * rng.paretovariate(2) / 4
+        degree = min(players - 1, int(wanted + rng.random()))
+        # Compañeros entre los demás jugadores, sin sortear a i
+        for j in rng.sample(range(players - 1), degree):
+            j += j >= i
+            pairs.add((min(i, j), max(i, j)))
+    return sorted(pairs)
+
+
+def generate_friends(pairs, prefix, batch_size=BATCH_SIZE):
+    for start in range(0, len(pairs), batch_size):
+        yield [
+            {
+                "id1": player_id(prefix, a),
+                "id2": player_id(prefix, b),
+                "approved": 1,
+                "petitioner": player_id(prefix, a),
+            }
+            for a, b in pairs[start : start + batch_size]
+        ]
+
+
+# `sample` recibe, por jugador, algunos ids de sus pokemon para armar trades
+# después sin tener millones de ids en memoria
+def generate_pokemon(
+    players, per_player, species, rng, prefix, sample=None, batch_size=BATCH_SIZE
+):
+    today = datetime.date.today()
+    batch = []
+    for i in range(players):
+        ids = sortable_ids(per_player, 24)
+        if sample is not None and ids:
+            sample[i] = ids[:4]
+        for owned_id in ids:
+            batch.append(
+                {
+                    "id": owned_id,
+                    "player_id": player_id(prefix, i),
+                    "pokedex_number": rng.choice(species),
+                    "in_team": 0,
+                    "obtained_at": today - datetime.timedelta(days=rng.randrange(365)),
+                }
+            )
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate_trades(pairs, count, owned_sample, rng, prefix, batch_size=BATCH_SIZE):
+    chosen = [
+        (a, b)
+        for a, b in rng.sample(pairs, min(len(pairs), count))
+        if owned_sample.get(a) and owned_sample.get(b)
+    ]
+    now = datetime.datetime.now()
+    for start in range(0, len(chosen), batch_size):
+        batch = chosen[start : start + batch_size]
+        yield [
+            {
+                "id": trade_id,
+                "requester_id": player_id(prefix, a),
+                "receiver_id": player_id(prefix, b),
+                "requester_pokemon_id": rng.choice(owned_sample[a]),
+                "receiver_pokemon_id": rng.choice(owned_sample[b]),
+                "status": TradeStatus.pending.name,
+                "created_at": now,
+            }
+            for trade_id, (a, b) in zip(uuid7s(len(batch)), batch)
+        ]
+
+
+def write_csv(path, batches):
+    rows = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = None
+        for batch in batches:
+            if not batch:
+                continue
+            if writer is None:
+                writer = csv.DictWriter(
+                    f, fieldnames=list(batch[0]), lineterminator="\n"
+                )
+                writer.writeheader()
+            writer.writerows(batch)
+            rows += len(batch)
+    return rows
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request
+
+CACHE_URL = os.getenv("CACHE_URL", "")
+CACHE_TTL = int(os.getenv("CACHE_TTL", "300"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key):
+        pass
+
+    @abstractmethod
+    def set(self, key, value, ttl=None):
+        pass
+
+    @abstractmethod
+    def delete(self, *keys):
+        pass
+
+
+# LRU en memoria del proceso. Solo es consistente con un único worker: con
+# varios workers cada uno tiene su copia y hay que usar CACHE_URL=redis://...
+# (ver create_cache)
+class LocalCache(CacheBackend):
+    shared = False
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+class RedisCache(CacheBackend):
+    shared = True
+
+    def __init__(self, url=None, client=None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url)
+        self._client = client
+
+    def get(self, key):
+        return self._client.get(key)
+
+    def set(self, key, value, ttl=None):
+        self._client.set(key, value, ex=ttl)
+
+    def delete(self, *keys):
+        if keys:
+            self._client.delete(*keys)
+
+
+# CACHE_URL elige el backend de la caché de respuestas:
+#   redis://, rediss://, unix://   Redis compartido por todos los workers
+#   local                          LRU en memoria; solo para un único proceso
+#                                  (app.py, gunicorn -w 1, uvicorn sin --workers)
+#   vacío                          sin caché de respuestas
+# Con varios procesos cada uno tendría su LocalCache y un invalidate() solo
+# llegaría al worker que atendió la escritura, así que nunca es el default.
+def create_cache(url=CACHE_URL):
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisCache(url)
+    if url == "local":
+        return LocalCache()
+    if url:
+        raise ValueError(f"Unsupported CACHE_URL {url!r}")
+    return None
+
+
+cache = create_cache()
+
+
+# Cada jugador tiene un token de versión por espacio (friends, pokemon,
+# trades). Las respuestas se guardan bajo claves que incluyen esos tokens, así
+# que invalidar es borrar el token: la siguiente lectura genera uno nuevo y
+# las entradas viejas quedan huérfanas hasta que expiran. Los tokens duran
+# CACHE_TTL como las respuestas, así que nada sobrevive más que eso a un
+# invalidate() perdido.
+def _version_key(namespace, player_id):
+    return f"ver:{namespace}:{player_id}"
+
+
+def scope_version(namespace, player_id):
+    key = _version_key(namespace, player_id)
+    version = cache.get(key)
+    if version is None:
+        version = secrets.token_hex(8)
+        cache.set(key, version, CACHE_TTL)
+    elif isinstance(version, bytes):
+        version = version.decode()
+    return version
+
+
+def invalidate(namespace, *player_ids):
+    if cache is None:
+        return
+    cache.delete(*[_version_key(namespace, player_id) for player_id in player_ids])
+
+
+# Cabeceras de la respuesta que se guardan junto con el cuerpo
+CACHED_HEADERS = ("X-Next-Cursor",)
+
+
+def _pack(response):
+    headers = {
+        name: response.headers[name]
+        for name in CACHED_HEADERS
+        if name in response.headers
+    }
+    return json.dumps(headers).encode() + b"\n" + response.get_data()
+
+
+def _unpack(entry):
+    headers, body = entry.split(b"\n", 1)
+    response = current_app.response_class(body, mimetype="application/json")
+    response.headers.update(json.loads(headers))
+    return response
+
+
+# Guarda el cuerpo JSON (y CACHED_HEADERS) de las respuestas 200 del
+# endpoint. `scopes` recibe los mismos argumentos que la vista y devuelve los
+# (espacio, jugador) de los que depende la respuesta. Con etag=True la misma
+# huella se manda como ETag y un If-None-Match que coincida responde 304 sin
+# ejecutar la vista. Sin CACHE_URL (ver create_cache) siempre se ejecuta la
+# vista y el ETag es el hash del cuerpo, que no depende del worker.
+def cached_response(scopes, ttl=CACHE_TTL, etag=False):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if cache is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if etag and response.status_code == 200 and not response.is_streamed:
+                    digest = hashlib.sha1(response.get_data()).hexdigest()
+                    if digest in request.if_none_match:
+                        response = current_app.response_class(status=304)
+                    _conditional_headers(response, digest)
+                return response
+
+            versions = [
+                f"{namespace}:{player_id}:{scope_version(namespace, player_id)}"
+                for namespace, player_id in scopes(*args, **kwargs)
+            ]
+            digest = hashlib.sha1(
+                "|".join(
+                    [request.endpoint] + versions + [request.query_string.decode()]
+                ).encode()
+            ).hexdigest()
+
+            if etag and digest in request.if_none_match:
+                response = current_app.response_class(status=304)
+                return _conditional_headers(response, digest)
+
+            key = f"resp:{digest}"
+            entry = cache.get(key)
+            if entry is not None:
+                response = _unpack(entry)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                if (
+                    response.mimetype == "application/json"
+                    and not response.is_streamed
+                ):
+                    cache.set(key, _pack(response), ttl)
+
+            if etag:
+                _conditional_headers(response, digest)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _conditional_headers(response, digest):
+    response.set_etag(digest)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
@@ -0,0 +1,65 @@
+import random
+import threading
+
+from helpers.helpers import WeightedSampler
+from helpers.species_cache import species_cache
+
+
+class CaptureSampler:
+    def __init__(self, cache=species_cache):
+        self._cache = cache
+        self._lock = threading.Lock()
+        self._table = None
+        self._version = None
+
+    # Volver a llamar cuando se edite la tabla pokemon_stat
+    def reload(self):
+        self._cache.reload()
+        self._current()
+
+    # Tabla de sorteo armada desde la caché de especies; se reconstruye solo
+    # cuando la caché cambia de versión
+    def _current(self):
+        version, all_species = self._cache.snapshot()
+        table = self._table
+        if table is not None and self._version == version:
+            return table
+
+        with self._lock:
+            if self._table is not None and self._version == version:
+                return self._table
+
+            buckets = {}
+            for pokedex_number in sorted(all_species):
+                name, capture_rate = all_species[pokedex_number]
+                if capture_rate is not None:
+                    buckets.setdefault(capture_rate, []).append((pokedex_number, name))
+
+            if not buckets:
+                # Sin especies sorteables: recargar en el siguiente intento
+                self._cache.invalidate()
+                raise ValueError("No pokemon species loaded")
+
+            # Mismo reparto que antes: un boleto por especie con ese capture_rate
+            rates = WeightedSampler(
+                {rate: len(group) for rate, group in buckets.items()}
+            )
+            species = {rate: tuple(group) for rate, group in buckets.items()}
+
+            # Se reemplaza la tabla completa de una vez para que los lectores
+            # nunca vean un estado a medias
+            self._table = (rates, species)
+            self._version = version
+            return self._table
+
+    # Devuelve (pokedex_number, name) sin tocar la base de datos
+    def draw(self):
+        rates, species = self._current()
+        return random.choice(species[rates.draw()])
+
+    def sample(self, k):
+        rates, species = self._current()
+        return [random.choice(species[rate]) for rate in rates.sample(k)]
+
+
+capture_sampler = CaptureSampler()
@@ -1,19 +1,71 @@
 import random
-import string
+
+from sqlalchemy import and_, func
+
+from helpers.ids import random_id
+from models.models import t_friend
 
 
 def create_id(length):
-    # combinación de letras y dígitos
-    characters = string.ascii_letters + string.digits
+    # combinación de letras y dígitos (ver helpers/ids.py)
+    return random_id(length)
+
+
+class WeightedSampler:
+    # Método alias (Vose): se arma una vez en O(n) y cada sorteo es O(1)
+    def __init__(self, weights):
+        keys = [key for key, value in weights.items() if value > 0]
+        if not keys:
+            raise ValueError("No weights to sample from")
+
+        n = len(keys)
+        total = sum(weights[key] for key in keys)
+        scaled = [weights[key] * n / total for key in keys]
+        prob = [1.0] * n
+        alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
 
-    random_string = "".join(random.choice(characters) for _ in range(length))
+        self.keys = tuple(keys)
+        self._prob = tuple(prob)
+        self._alias = tuple(alias)
+        self._n = n
 
-    return random_string
+    def draw(self):
+        i = int(random.random() * self._n)
+        if random.random() >= self._prob[i]:
+            i = self._alias[i]
+        return self.keys[i]
 
+    def sample(self, k):
+        keys, prob, alias, n = self.keys, self._prob, self._alias, self._n
+        rand = random.random
+        result = []
+        for _ in range(k):
+            i = int(rand() * n)
+            if rand() >= prob[i]:
+                i = alias[i]
+            result.append(keys[i])
+        return result
 
-def choose_capture_rate(capture_rates):
-    tickets = []
-    for key, value in capture_rates.items():
-        tickets.extend([key] * value)
 
-    return random.choice(tickets)
+# Condición sobre el índice único (id_min, id_max) para la amistad entre dos
+# jugadores, sin importar quién sea id1 o id2. LEAST/GREATEST se evalúan en
+# la base para que el orden coincida con la collation de las columnas.
+def friendship_key(player_a, player_b):
+    return and_(
+        t_friend.c.id_min == func.least(player_a, player_b),
+        t_friend.c.id_max == func.greatest(player_a, player_b),
+    )
@@ -0,0 +1,86 @@
+import os
+import string
+import time
+import uuid
+
+BASE62 = string.digits + string.ascii_uppercase + string.ascii_lowercase
+BASE36 = string.digits + string.ascii_lowercase
+
+# Tabla para bytes.translate: cada byte < 248 (4 * 62) pasa a un carácter
+# base62 sin sesgo y los 8 valores restantes se descartan
+_BASE62_TABLE = bytes(ord(BASE62[b % 62]) if b < 248 else 0 for b in range(256))
+_BASE62_REJECT = bytes(range(248, 256))
+
+# 48 bits de milisegundos caben en 10 dígitos base36. Solo minúsculas y
+# dígitos para que el orden se mantenga también con collations que no
+# distinguen mayúsculas (la de MySQL por defecto).
+_TIMESTAMP_LENGTH = 10
+
+
+def _random_chars(count):
+    # Pedir un poco más de lo necesario para cubrir los bytes descartados
+    chars = os.urandom(count + count // 16 + 4).translate(
+        _BASE62_TABLE, _BASE62_REJECT
+    )
+    while len(chars) < count:
+        chars += os.urandom(count).translate(_BASE62_TABLE, _BASE62_REJECT)
+    return chars[:count].decode("ascii")
+
+
+def _timestamp_prefix(ms):
+    digits = []
+    for _ in range(_TIMESTAMP_LENGTH):
+        ms, remainder = divmod(ms, 36)
+        digits.append(BASE36[remainder])
+    return "".join(reversed(digits))
+
+
+_last_prefix = (None, "")
+
+
+# El prefijo se recalcula una vez por milisegundo
+def _current_prefix():
+    global _last_prefix
+    ms = time.time_ns() // 1_000_000
+    last_ms, prefix = _last_prefix
+    if ms != last_ms:
+        prefix = _timestamp_prefix(ms)
+        _last_prefix = (ms, prefix)
+    return prefix
+
+
+# ID aleatorio base62 con os.urandom (criptográficamente seguro)
+def random_id(length):
+    return _random_chars(length)
+
+
+def random_ids(count, length):
+    chars = _random_chars(count * length)
+    return [chars[i : i + length] for i in range(0, count * length, length)]
+
+
+# ID ordenado por tiempo: prefijo de milisegundos + resto aleatorio. Los
+# inserts quedan al final del índice en lugar de repartirse por todo el B-tree.
+def sortable_id(length):
+    return _current_prefix() + _random_chars(length - _TIMESTAMP_LENGTH)
+
+
+def sortable_ids(count, length):
+    prefix = _current_prefix()
+    return [prefix + suffix for suffix in random_ids(count, length - _TIMESTAMP_LENGTH)]
+
+
+# UUID versión 7 (RFC 9562): 48 bits de milisegundos y 74 bits aleatorios
+def uuid7():
+    ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76
+    value |= ((rand >> 62) & 0xFFF) << 64
+    value |= 0b10 << 62
+    value |= rand & 0x3FFFFFFFFFFFFFFF
+    return str(uuid.UUID(int=value))
+
+
+def uuid7s(count):
+    return [uuid7() for _ in range(count)]
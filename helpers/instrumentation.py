@@ -0,0 +1,244 @@
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config.db import pool_metrics
+
+logger = logging.getLogger("pocket_rivals.instrumentation")
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "").lower() in ("1", "true", "yes")
+SLOW_QUERY_SECONDS = float(os.getenv("SLOW_QUERY_SECONDS", "0.5"))
+# Perfilado: una petición con el header X-Profile (o una fracción al azar con
+# PROFILE_SAMPLE_RATE) se perfila solo si PROFILE_ENABLED está activo. El
+# header tiene que traer el secreto de PROFILE_TOKEN; sin PROFILE_TOKEN se
+# ignora y solo queda el muestreo.
+PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "").lower() in ("1", "true", "yes")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR")
+PROFILE_HEADER = "X-Profile"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class EndpointStats:
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.latency = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.pool_wait = 0.0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = {}
+
+    def record(self, endpoint, latency, queries, db_time, rows, pool_wait):
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = EndpointStats()
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if latency <= bound:
+                    stats.buckets[i] += 1
+            stats.count += 1
+            stats.latency += latency
+            stats.queries += queries
+            stats.db_time += db_time
+            stats.rows += rows
+            stats.pool_wait += pool_wait
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                endpoint: (
+                    list(stats.buckets),
+                    stats.count,
+                    stats.latency,
+                    stats.queries,
+                    stats.db_time,
+                    stats.rows,
+                    stats.pool_wait,
+                )
+                for endpoint, stats in self.endpoints.items()
+            }
+
+
+registry = MetricsRegistry()
+
+
+def _request_stats():
+    if has_request_context():
+        return g.get("_instrumentation")
+    return None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+
+    stats = _request_stats()
+    if stats is not None:
+        stats["queries"] += 1
+        stats["db_time"] += elapsed
+        if cursor.rowcount and cursor.rowcount > 0:
+            stats["rows"] += cursor.rowcount
+
+    if elapsed >= SLOW_QUERY_SECONDS:
+        logger.warning(
+            "Slow query (%.3fs) on %s: %s",
+            elapsed,
+            request.endpoint if has_request_context() else "-",
+            " ".join(statement.split())[:500],
+        )
+
+
+def _record_pool_wait(seconds):
+    stats = _request_stats()
+    if stats is not None:
+        stats["pool_wait"] += seconds
+
+
+def _should_profile():
+    if not PROFILE_ENABLED:
+        return False
+    token = request.headers.get(PROFILE_HEADER, "").encode()
+    if PROFILE_TOKEN and hmac.compare_digest(token, PROFILE_TOKEN.encode()):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def _before_request():
+    g._instrumentation = {
+        "start": time.perf_counter(),
+        "queries": 0,
+        "db_time": 0.0,
+        "rows": 0,
+        "pool_wait": 0.0,
+    }
+    if _should_profile():
+        profiler = cProfile.Profile()
+        g._profiler = profiler
+        profiler.enable()
+
+
+def _after_request(response):
+    stats = g.pop("_instrumentation", None)
+    if stats is None:
+        return response
+
+    profiler = g.pop("_profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        _report_profile(profiler)
+
+    registry.record(
+        request.endpoint or "unmatched",
+        time.perf_counter() - stats["start"],
+        stats["queries"],
+        stats["db_time"],
+        stats["rows"],
+        stats["pool_wait"],
+    )
+    response.headers["X-DB-Queries"] = str(stats["queries"])
+    return response
+
+
+def _report_profile(profiler):
+    if PROFILE_DIR:
+        path = os.path.join(
+            PROFILE_DIR, f"{request.endpoint}-{time.time_ns()}.prof"
+        )
+        profiler.dump_stats(path)
+        logger.info("Profile for %s written to %s", request.path, path)
+        return
+
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(30)
+    logger.info("Profile for %s\n%s", request.path, output.getvalue())
+
+
+def init_instrumentation(app):
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        pool_metrics.listeners.append(_record_pool_wait)
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+# Formato de texto de Prometheus
+def render_prometheus(pool, species):
+    lines = [
+        "# HELP http_request_duration_seconds Request latency by endpoint.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    snapshot = registry.snapshot()
+    for endpoint, (buckets, count, latency, *_) in snapshot.items():
+        label = f'endpoint="{_label(endpoint)}"'
+        for bound, value in zip(LATENCY_BUCKETS, buckets):
+            lines.append(
+                f'http_request_duration_seconds_bucket{{{label},le="{bound}"}} {value}'
+            )
+        lines.append(
+            f'http_request_duration_seconds_bucket{{{label},le="+Inf"}} {count}'
+        )
+        lines.append(f"http_request_duration_seconds_sum{{{label}}} {latency}")
+        lines.append(f"http_request_duration_seconds_count{{{label}}} {count}")
+
+    counters = (
+        ("db_queries_total", "DB queries run by endpoint.", 3),
+        ("db_time_seconds_total", "Time spent in DB queries by endpoint.", 4),
+        ("db_rows_total", "Rows returned or affected by endpoint.", 5),
+        ("db_pool_wait_seconds_total", "Pool checkout wait by endpoint.", 6),
+    )
+    for name, help_text, index in counters:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for endpoint, values in snapshot.items():
+            lines.append(f'{name}{{endpoint="{_label(endpoint)}"}} {values[index]}')
+
+    gauges = (
+        ("db_pool_size", pool["pool_size"]),
+        ("db_pool_checked_out", pool["checked_out"]),
+        ("db_pool_overflow", pool["overflow"]),
+        ("db_pool_checkout_wait_seconds_max", pool["checkout_wait_seconds_max"]),
+        ("species_cache_size", species["size"]),
+    )
+    for name, value in gauges:
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+
+    totals = (
+        ("db_pool_checkouts_total", pool["checkouts"]),
+        ("db_pool_checkout_wait_seconds_total", pool["checkout_wait_seconds_total"]),
+        ("species_cache_hits_total", species["hits"]),
+        ("species_cache_misses_total", species["misses"]),
+    )
+    for name, value in totals:
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {value}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,78 @@
+import enum
+from functools import lru_cache
+
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Tipos que no son JSON por sí solos: filas de select(...) y entidades ORM se
+# convierten directo, sin que cada ruta arme un dict intermedio. Los enums
+# (TradeStatus) van por su valor, igual que con orjson.
+def _to_builtin(obj):
+    if isinstance(obj, enum.Enum):
+        return obj.value
+
+    if hasattr(obj, "_asdict"):
+        return obj._asdict()
+
+    mapper = getattr(obj, "__mapper__", None)
+    if mapper is not None:
+        return {attr.key: getattr(obj, attr.key) for attr in mapper.column_attrs}
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Las fechas se repiten mucho en una colección (obtained_at) y http_date es
+# lo más caro de la codificación: cada valor distinto se formatea una vez
+@lru_cache(maxsize=4096)
+def _http_date(value):
+    return http_date(value)
+
+
+class RowJSONProvider(DefaultJSONProvider):
+    @staticmethod
+    def default(o):
+        try:
+            return _to_builtin(o)
+        except TypeError:
+            return DefaultJSONProvider.default(o)
+
+
+# Mismo formato que el proveedor por defecto de Flask (llaves ordenadas, fechas
+# como HTTP date, enums por su valor) pero codificado con orjson
+class OrjsonProvider(RowJSONProvider):
+    @staticmethod
+    def _orjson_default(o):
+        if hasattr(o, "timetuple"):
+            return _http_date(o)
+        return _to_builtin(o)
+
+    def _dumps_bytes(self, obj):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self._orjson_default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self._dumps_bytes(obj), mimetype=self.mimetype
+        )
+
+
+JSONProvider = OrjsonProvider if orjson is not None else RowJSONProvider
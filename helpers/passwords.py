@@ -0,0 +1,102 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+# bcrypt se calcula en procesos aparte para no ocupar el hilo de la petición
+# (ni la conexión a la base) mientras dura el hash
+BCRYPT_LOG_ROUNDS = int(os.getenv("BCRYPT_LOG_ROUNDS", "12"))
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE", str(HASH_WORKERS * 4)))
+HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+# bcrypt se importa dentro de los procesos del pool, no al arrancar la app
+def _hash(password, rounds):
+    import bcrypt
+
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode(
+        "utf-8"
+    )
+
+
+def _check(pw_hash, password):
+    import bcrypt
+
+    return bcrypt.checkpw(password.encode("utf-8"), pw_hash.encode("utf-8"))
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(HASH_QUEUE_LIMIT)
+
+
+# Los workers del servidor tienen hilos (gthread, a2wsgi) y hacer fork de un
+# proceso con hilos puede dejar al hijo bloqueado en un lock heredado: los
+# procesos del pool salen de un forkserver (spawn donde no existe)
+def _mp_context():
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+# El pool se crea en el primer uso para que cada worker del servidor tenga el suyo
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=HASH_WORKERS, mp_context=_mp_context()
+                )
+    return _executor
+
+
+# Un proceso del pool murió (OOM, kill): el pool queda roto para siempre, así
+# que se descarta y el siguiente uso crea uno nuevo
+def _discard_executor(executor):
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _run(fn, *args):
+    if not _slots.acquire(blocking=False):
+        raise PasswordHasherBusy("Server busy, try again later")
+
+    executor = _get_executor()
+    try:
+        future = executor.submit(fn, *args)
+    except BrokenProcessPool:
+        _slots.release()
+        _discard_executor(executor)
+        raise PasswordHasherBusy("Password hasher restarting, try again later")
+    except Exception:
+        _slots.release()
+        raise
+
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return future.result(timeout=HASH_TIMEOUT)
+    except FutureTimeoutError:
+        # El hash sigue en el pool y libera su lugar en la cola al terminar
+        raise PasswordHasherBusy("Password hashing timed out, try again later")
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        raise PasswordHasherBusy("Password hasher restarting, try again later")
+
+
+def generate_password_hash(password):
+    return _run(_hash, password, BCRYPT_LOG_ROUNDS)
+
+
+def check_password_hash(pw_hash, password):
+    return _run(_check, pw_hash, password)
@@ -0,0 +1,63 @@
+import datetime
+import os
+
+from sqlalchemy import case, or_, select, update
+
+from models.models import Player
+
+# Pokeballs por jugador por día (0 = sin límite)
+POKEBALLS_PER_DAY = int(os.getenv("POKEBALLS_PER_DAY", "0"))
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+# Descuenta `count` pokeballs del día con un solo UPDATE condicional: la
+# verificación y el incremento son atómicos en la base, así que capturas
+# simultáneas del mismo jugador no pueden pasarse del límite (la segunda
+# espera el bloqueo de la fila y vuelve a evaluar la condición). El UPDATE
+# deja la fila del jugador bloqueada hasta el commit o rollback de la sesión.
+#
+# El contador se reinicia cuando last_opened no es hoy. MySQL aplica las
+# asignaciones de izquierda a derecha y cada una ve las anteriores, así que
+# pokeballs_opened tiene que ir antes que last_opened en el SET. values()
+# las escribe en el orden de las columnas de la tabla (last_opened primero),
+# por eso se usa ordered_values().
+def consume_pokeballs(session, player_id, count=1, limit=None, today=None):
+    limit = POKEBALLS_PER_DAY if limit is None else limit
+    today = today or datetime.date.today()
+
+    if count > limit:
+        raise QuotaExceeded(f"You can open at most {limit} pokeballs per day")
+
+    result = session.execute(
+        update(Player)
+        .where(
+            Player.id == player_id,
+            or_(
+                Player.last_opened.is_(None),
+                Player.last_opened != today,
+                Player.pokeballs_opened + count <= limit,
+            ),
+        )
+        .ordered_values(
+            (
+                Player.pokeballs_opened,
+                case(
+                    (Player.last_opened == today, Player.pokeballs_opened + count),
+                    else_=count,
+                ),
+            ),
+            (Player.last_opened, today),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    if result.rowcount == 1:
+        return
+
+    # Solo en el camino de error: distinguir jugador inexistente de cuota agotada
+    if not session.execute(select(Player.id).where(Player.id == player_id)).first():
+        raise LookupError("Player not found")
+    raise QuotaExceeded(f"You can open at most {limit} pokeballs per day")
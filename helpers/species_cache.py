@@ -0,0 +1,80 @@
+import os
+import threading
+import time
+
+from config.db import SessionLocal
+from models.models import PokemonStat
+
+SPECIES_CACHE_TTL = float(os.getenv("SPECIES_CACHE_TTL", "3600"))
+
+
+# Copia en memoria de pokemon_stat (nombre y capture_rate por pokedex_number).
+# Cada recarga sube `version`; los que derivan datos de la caché (como el
+# sorteo de capturas) la comparan para saber cuándo reconstruirse.
+class SpeciesCache:
+    def __init__(self, ttl=SPECIES_CACHE_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._species = {}
+        self._expires_at = 0.0
+
+    def _load(self):
+        with SessionLocal() as session:
+            rows = session.query(
+                PokemonStat.pokedex_number,
+                PokemonStat.name,
+                PokemonStat.capture_rate,
+            ).all()
+
+        self._species = {
+            pokedex_number: (name, capture_rate)
+            for pokedex_number, name, capture_rate in rows
+        }
+        # Una tabla vacía (arranque antes de cargar especies) no se guarda por
+        # todo el TTL: la siguiente lectura vuelve a consultar
+        self._expires_at = time.monotonic() + self.ttl if self._species else 0.0
+        self.version += 1
+
+    def reload(self):
+        with self._lock:
+            self._load()
+
+    # Llamar después de editar pokemon_stat; la siguiente lectura recarga
+    def invalidate(self):
+        self._expires_at = 0.0
+
+    def snapshot(self):
+        if time.monotonic() >= self._expires_at:
+            with self._lock:
+                # Otro hilo pudo recargar mientras se esperaba el lock
+                if time.monotonic() >= self._expires_at:
+                    self._load()
+        return self.version, self._species
+
+    def name(self, pokedex_number):
+        _, species = self.snapshot()
+        entry = species.get(pokedex_number)
+        if entry is None:
+            # Especie agregada después de la última carga
+            self.misses += 1
+            self.reload()
+            entry = self._species.get(pokedex_number)
+            if entry is None:
+                return None
+        else:
+            self.hits += 1
+        return entry[0]
+
+    def stats(self):
+        return {
+            "version": self.version,
+            "size": len(self._species),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+species_cache = SpeciesCache()
@@ -0,0 +1,154 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.mysql import TINYINT
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "player",
+        sa.Column("id", sa.String(32), primary_key=True),
+        sa.Column("username", sa.String(20), nullable=False),
+        sa.Column("email", sa.String(50), nullable=False),
+        sa.Column("password", sa.String(100), nullable=False),
+        sa.Column("last_opened", sa.Date()),
+    )
+
+    op.create_table(
+        "pokemon_stat",
+        sa.Column("pokedex_number", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(50), nullable=False),
+        sa.Column("type1", sa.String(20), nullable=False),
+        sa.Column("classification", sa.String(50)),
+        sa.Column("base_total", sa.Integer()),
+        sa.Column("type2", sa.String(20)),
+        sa.Column("generation", sa.Integer()),
+        sa.Column("capture_rate", sa.Integer()),
+        sa.Column("is_legendary", TINYINT(1)),
+    )
+
+    op.create_table(
+        "friend",
+        sa.Column("id1", sa.String(32), nullable=False),
+        sa.Column("id2", sa.String(32), nullable=False),
+        sa.Column(
+            "id_min",
+            sa.String(100),
+            sa.Computed("(least(`id1`,`id2`))", persisted=True),
+        ),
+        sa.Column(
+            "id_max",
+            sa.String(100),
+            sa.Computed("(greatest(`id1`,`id2`))", persisted=True),
+        ),
+        sa.Column(
+            "approved", TINYINT(1), nullable=False, server_default=sa.text("'0'")
+        ),
+        sa.Column("petitioner", sa.String(100), nullable=False),
+        sa.CheckConstraint("(`petitioner` in (`id1`,`id2`))", name="friend_chk_1"),
+        sa.ForeignKeyConstraint(["id1"], ["player.id"], name="friend_ibfk_1"),
+        sa.ForeignKeyConstraint(["id2"], ["player.id"], name="friend_ibfk_2"),
+        sa.ForeignKeyConstraint(["petitioner"], ["player.id"], name="friend_ibfk_3"),
+    )
+    op.create_index("id1", "friend", ["id1"])
+    op.create_index("id2", "friend", ["id2"])
+    op.create_index("id_min", "friend", ["id_min", "id_max"], unique=True)
+    op.create_index("petitioner", "friend", ["petitioner"])
+
+    op.create_table(
+        "pokeball_history",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("user_id", sa.String(32), nullable=False),
+        sa.Column("awarded_pokemon_number", sa.Integer(), nullable=False),
+        sa.Column("opened_at", sa.Date()),
+        sa.ForeignKeyConstraint(
+            ["awarded_pokemon_number"],
+            ["pokemon_stat.pokedex_number"],
+            name="fk_pokeball_pokemon",
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["player.id"], name="fk_pokeball_user"),
+    )
+    op.create_index(
+        "fk_pokeball_pokemon", "pokeball_history", ["awarded_pokemon_number"]
+    )
+    op.create_index("fk_pokeball_user", "pokeball_history", ["user_id"])
+
+    op.create_table(
+        "pokemon_owned",
+        sa.Column("id", sa.String(24), primary_key=True),
+        sa.Column("player_id", sa.String(32), nullable=False),
+        sa.Column("pokedex_number", sa.Integer(), nullable=False),
+        sa.Column("in_team", TINYINT(1), nullable=False),
+        sa.Column("obtained_at", sa.Date(), nullable=False),
+        sa.Column("mote", sa.String(20)),
+        sa.ForeignKeyConstraint(
+            ["player_id"],
+            ["player.id"],
+            ondelete="CASCADE",
+            onupdate="CASCADE",
+            name="fk_player",
+        ),
+        sa.ForeignKeyConstraint(
+            ["pokedex_number"],
+            ["pokemon_stat.pokedex_number"],
+            ondelete="RESTRICT",
+            onupdate="CASCADE",
+            name="fk_pokemon",
+        ),
+    )
+    op.create_index("fk_player", "pokemon_owned", ["player_id"])
+    op.create_index("fk_pokemon", "pokemon_owned", ["pokedex_number"])
+
+    op.create_table(
+        "trade",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("requester_id", sa.String(32), nullable=False),
+        sa.Column("receiver_id", sa.String(32), nullable=False),
+        sa.Column("requester_pokemon_id", sa.String(24), nullable=False),
+        sa.Column("receiver_pokemon_id", sa.String(24), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("pending", "accepted", "rejected", name="tradestatus"),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("decided_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["requester_id"], ["player.id"], name="fk_trade_requester"
+        ),
+        sa.ForeignKeyConstraint(
+            ["receiver_id"], ["player.id"], name="fk_trade_receiver"
+        ),
+        sa.ForeignKeyConstraint(
+            ["requester_pokemon_id"],
+            ["pokemon_owned.id"],
+            name="fk_trade_requester_pokemon",
+        ),
+        sa.ForeignKeyConstraint(
+            ["receiver_pokemon_id"],
+            ["pokemon_owned.id"],
+            name="fk_trade_receiver_pokemon",
+        ),
+    )
+    op.create_index("fk_trade_requester", "trade", ["requester_id"])
+    op.create_index("fk_trade_receiver", "trade", ["receiver_id"])
+
+
+def downgrade():
+    op.drop_table("trade")
+    op.drop_table("pokemon_owned")
+    op.drop_table("pokeball_history")
+    op.drop_table("friend")
+    op.drop_table("pokemon_stat")
+    op.drop_table("player")
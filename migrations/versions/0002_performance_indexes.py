@@ -0,0 +1,24 @@
+"""performance indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Paginación por (obtained_at, id) de la colección de cada jugador
+    op.create_index(
+        "ix_player_obtained", "pokemon_owned", ["player_id", "obtained_at", "id"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_player_obtained", table_name="pokemon_owned")
@@ -0,0 +1,31 @@
+"""pokeball quota counter
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Pokeballs abiertas en el día de last_opened (ver helpers/quota.py)
+    op.add_column(
+        "player",
+        sa.Column(
+            "pokeballs_opened",
+            sa.Integer(),
+            nullable=False,
+            server_default=sa.text("'0'"),
+        ),
+    )
+
+
+def downgrade():
+    op.drop_column("player", "pokeballs_opened")
@@ -31,6 +31,9 @@ class Player(Base):
     email: Mapped[str] = mapped_column(String(50), nullable=False)
     password: Mapped[str] = mapped_column(String(100), nullable=False)
     last_opened: Mapped[Optional[datetime.date]] = mapped_column(Date)
+    pokeballs_opened: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("'0'")
+    )
 
     pokeball_history: Mapped[list["PokeballHistory"]] = relationship(
         "PokeballHistory", back_populates="user"
@@ -124,6 +127,7 @@ class PokemonOwned(Base):
         ),
         Index("fk_player", "player_id"),
         Index("fk_pokemon", "pokedex_number"),
+        Index("ix_player_obtained", "player_id", "obtained_at", "id"),
     )
 
     id: Mapped[str] = mapped_column(String(24), primary_key=True)
@@ -1,80 +1,178 @@
 from flask import Blueprint, jsonify, request
-from flask_bcrypt import Bcrypt
-from sqlalchemy import func, or_
-from helpers.helpers import choose_capture_rate, create_id
-from models.models import Player, PokemonOwned, PokemonStat
-from config.db import SessionLocal
+from sqlalchemy import func, insert, select
+from helpers.cache import invalidate
+from helpers.capture_sampler import capture_sampler
+from helpers.ids import sortable_id, sortable_ids, uuid7, uuid7s
+from helpers.quota import POKEBALLS_PER_DAY, QuotaExceeded, consume_pokeballs
+from models.models import Player, PokeballHistory, PokemonOwned
+from config.db import get_session
 from flask_jwt_extended import jwt_required, get_jwt_identity
-import random
 from datetime import datetime
+import os
 
 capture_pokemon = Blueprint("capture_pokemon", __name__)
 
-bcrypt = Bcrypt()
+# Máximo de pokeballs por petición y de Pokemon por jugador (0 = sin límite)
+MAX_CAPTURE_BATCH = int(os.getenv("MAX_CAPTURE_BATCH", "10"))
+MAX_POKEMON_OWNED = int(os.getenv("MAX_POKEMON_OWNED", "0"))
 
 
-# Capturar Pokemon aleatorio
-@capture_pokemon.route("/capture_pokemon", methods=["GET"])
-@jwt_required()
-def get_a_pokemon():
-    try:
-        player_id = get_jwt_identity()
-        session = SessionLocal()
+class PokemonLimitReached(Exception):
+    pass
 
-        # Esto es para lo de verificar si ya hizo un lanzamiento antes de las horas
-        # session.query(Player.last_opened).filter(Player.id == player_id).first()
 
-        capture_rates = (
-            session.query(
-                PokemonStat.capture_rate, func.count(PokemonStat.capture_rate)
-            )
-            .group_by(PokemonStat.capture_rate)
-            .order_by(func.count(PokemonStat.capture_rate))
-        ).all()
+# Bloquea la fila del jugador hasta el commit para que capturas simultáneas
+# no puedan pasarse de los límites entre el conteo y el insert. Con cuota
+# diaria el UPDATE de la cuota ya toma ese bloqueo.
+def _reserve_captures(session, player_id, count):
+    if POKEBALLS_PER_DAY:
+        consume_pokeballs(session, player_id, count, limit=POKEBALLS_PER_DAY)
+    else:
+        locked_player = session.execute(
+            select(Player.id).where(Player.id == player_id).with_for_update()
+        ).first()
 
-        if not capture_rates:
-            raise ValueError("Problem")
+        if not locked_player:
+            raise LookupError("Player not found")
 
-        choosen = choose_capture_rate(dict(capture_rates))
+    if MAX_POKEMON_OWNED:
+        owned_count = session.execute(
+            select(func.count())
+            .select_from(PokemonOwned)
+            .where(PokemonOwned.player_id == player_id)
+        ).scalar_one()
 
-        print("CAPTURE RATE ELEGIDO: " + str(choosen))
+        if owned_count + count > MAX_POKEMON_OWNED:
+            raise PokemonLimitReached(
+                f"You can't own more than {MAX_POKEMON_OWNED} pokemon"
+            )
 
-        pokemon_list = (
-            session.query(PokemonStat.pokedex_number)
-            .filter(PokemonStat.capture_rate == choosen)
-            .all()
-        )
 
-        print(pokemon_list)
-        pokedex_numbers = []
-        for pokemon_tuple in pokemon_list:
-            pokedex_numbers.append(pokemon_tuple[0])
+# Capturar Pokemon aleatorio
+@capture_pokemon.route("/capture_pokemon", methods=["GET"])
+@jwt_required()
+def get_a_pokemon():
+    player_id = get_jwt_identity()
+    session = get_session()
+    try:
+        # Sin límites configurados no hace falta bloquear al jugador
+        if POKEBALLS_PER_DAY or MAX_POKEMON_OWNED:
+            _reserve_captures(session, player_id, 1)
 
-        final_pokedex_number = random.choice(pokedex_numbers)
+        final_pokedex_number, final_name = capture_sampler.draw()
 
-        final_pokemon = (
-            session.query(PokemonStat)
-            .filter(PokemonStat.pokedex_number == final_pokedex_number)
-            .first()
-        )
-
-        owned_pokemon_id = create_id(24)
-        message = f"You've captured {final_pokemon.name}"
+        owned_pokemon_id = sortable_id(24)
+        message = f"You've captured {final_name}"
+        now = datetime.now()
 
         owned_pokemon_data = PokemonOwned(
             id=owned_pokemon_id,
             player_id=player_id,
             pokedex_number=final_pokedex_number,
-            obtained_at=datetime.now(),
+            obtained_at=now,
             in_team=False,
         )
+        history = PokeballHistory(
+            id=uuid7(),
+            user_id=player_id,
+            awarded_pokemon_number=final_pokedex_number,
+            opened_at=now.date(),
+        )
 
-        session.add(owned_pokemon_data)
+        session.add_all([owned_pokemon_data, history])
         session.commit()
+        invalidate("pokemon", player_id)
 
         return jsonify({"message": message}), 201
+    except QuotaExceeded as e:
+        session.rollback()
+        return jsonify({"message": str(e)}), 429
+    except PokemonLimitReached as e:
+        session.rollback()
+        return jsonify({"message": str(e)}), 409
+    except LookupError as e:
+        session.rollback()
+        return jsonify({"message": str(e)}), 404
     except Exception as e:
+        session.rollback()
         return jsonify({"message": str(e)}), 500
 
-    finally:
-        session.close()
+
+# Abrir varias pokeballs en una sola petición
+@capture_pokemon.route("/capture_pokemon/batch", methods=["POST"])
+@jwt_required()
+def get_many_pokemon():
+    player_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
+    count = data.get("count")
+
+    if not isinstance(count, int) or isinstance(count, bool) or count < 1:
+        return jsonify({"message": "count must be a positive integer"}), 400
+
+    if count > MAX_CAPTURE_BATCH:
+        return (
+            jsonify({"message": f"You can open at most {MAX_CAPTURE_BATCH} pokeballs"}),
+            400,
+        )
+
+    session = get_session()
+    try:
+        _reserve_captures(session, player_id, count)
+
+        captured = capture_sampler.sample(count)
+        owned_ids = sortable_ids(count, 24)
+        history_ids = uuid7s(count)
+        now = datetime.now()
+
+        session.execute(
+            insert(PokemonOwned),
+            [
+                {
+                    "id": owned_id,
+                    "player_id": player_id,
+                    "pokedex_number": pokedex_number,
+                    "obtained_at": now,
+                    "in_team": False,
+                }
+                for owned_id, (pokedex_number, _) in zip(owned_ids, captured)
+            ],
+        )
+        session.execute(
+            insert(PokeballHistory),
+            [
+                {
+                    "id": history_id,
+                    "user_id": player_id,
+                    "awarded_pokemon_number": pokedex_number,
+                    "opened_at": now.date(),
+                }
+                for history_id, (pokedex_number, _) in zip(history_ids, captured)
+            ],
+        )
+        session.commit()
+        invalidate("pokemon", player_id)
+
+        return (
+            jsonify(
+                {
+                    "message": f"You've captured {count} pokemon",
+                    "captured": [
+                        {"pokedex_number": pokedex_number, "name": name}
+                        for pokedex_number, name in captured
+                    ],
+                }
+            ),
+            201,
+        )
+    except QuotaExceeded as e:
+        session.rollback()
+        return jsonify({"message": str(e)}), 429
+    except PokemonLimitReached as e:
+        session.rollback()
+        return jsonify({"message": str(e)}), 409
+    except LookupError as e:
+        session.rollback()
+        return jsonify({"message": str(e)}), 404
+    except Exception as e:
+        session.rollback()
+        return jsonify({"message": str(e)}), 500
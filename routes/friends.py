@@ -1,11 +1,17 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
-from sqlalchemy import delete, insert
+from sqlalchemy import delete, insert, select, union_all
+from helpers.auth import player_exists
+from helpers.cache import cached_response, invalidate
+from helpers.helpers import friendship_key
 from models.models import Player, t_friend
-from config.db import SessionLocal
+from config.db import get_session
 
 friends = Blueprint("friends", __name__)
 
+DEFAULT_FRIENDS_PAGE = 100
+MAX_FRIENDS_PAGE = 500
+
 # CHECAR SOLICITUDES
 
 
@@ -14,10 +20,17 @@ friends = Blueprint("friends", __name__)
 def get_requests():
     try:
         player_id = get_jwt_identity()
-        session = SessionLocal()
+        session = get_session()
 
+        # Las etiquetas son las llaves del JSON; las filas se serializan directo
         requests = (
-            session.query(t_friend, Player.username)
+            session.query(
+                t_friend.c.id_min.label("id1"),
+                t_friend.c.id_max.label("id2"),
+                Player.username.label("petitioner_name"),
+                t_friend.c.petitioner.label("petitoner"),
+                t_friend.c.approved,
+            )
             .join(Player, Player.id == t_friend.c.petitioner)
             .filter(
                 (
@@ -31,25 +44,11 @@ def get_requests():
         if not requests:
             return jsonify({"message": "No friend requests found"}), 404
 
-        requests_json = []
-        for req in requests:
-            requests_json.append(
-                {
-                    "id1": req.id_min,
-                    "id2": req.id_max,
-                    "petitioner_name": req.username,
-                    "petitoner": req.petitioner,
-                    "approved": req.approved,
-                }
-            )
-        return jsonify(requests_json), 200
+        return jsonify(requests), 200
 
     except Exception as e:
         return jsonify({"message": str(e)}), 500
 
-    finally:
-        session.close()
-
 
 # Mandar SOLICITUDES
 @friends.route("/friends/send_request", methods=["POST"])
@@ -64,13 +63,9 @@ def send_request():
         if not receiver_id:
             raise ValueError("No receiver player id")
 
-        session = SessionLocal()
+        session = get_session()
 
-        receiver_player_data = (
-            session.query(Player).filter(Player.id == receiver_id).first()
-        )
-
-        if not receiver_player_data:
+        if not player_exists(session, receiver_id):
             raise ValueError("That Player does not exist")
 
         query = insert(t_friend).values(
@@ -85,9 +80,6 @@ def send_request():
     except Exception as e:
         return jsonify({"message": str(e)}), 500
 
-    finally:
-        session.close()
-
 
 # ACEPTAR SOLICITUDES
 @friends.route("/friends/accept_request", methods=["POST"])
@@ -101,44 +93,30 @@ def accept_request():
         if not friend_id:
             return jsonify({"message": "friend_id is required"}), 400
 
-        session = SessionLocal()
+        session = get_session()
 
-        # Buscar la relación en cualquier orden
-        request_entry = (
-            session.query(t_friend)
-            .filter(
-                ((t_friend.c.id1 == player_id) & (t_friend.c.id2 == friend_id))
-                | ((t_friend.c.id1 == friend_id) & (t_friend.c.id2 == player_id)),
-                t_friend.c.approved == 0,
-            )
-            .first()
-        )
-
-        if not request_entry:
-            return jsonify({"message": "No pending request found"}), 404
-
-        # Actualizar approved -> 1
-        session.execute(
+        # Actualizar approved -> 1 solo si la solicitud sigue pendiente
+        result = session.execute(
             t_friend.update()
-            .where(
-                ((t_friend.c.id1 == player_id) & (t_friend.c.id2 == friend_id))
-                | ((t_friend.c.id1 == friend_id) & (t_friend.c.id2 == player_id))
-            )
+            .where(friendship_key(player_id, friend_id), t_friend.c.approved == 0)
             .values(approved=1)
         )
         session.commit()
+        invalidate("friends", player_id, friend_id)
 
-        friend_player = session.query(Player).filter(Player.id == friend_id).first()
-        friend_name = friend_player.username
+        if result.rowcount == 0:
+            return jsonify({"message": "No pending request found"}), 404
+
+        # El mensaje lleva el nombre de usuario, como antes; solo esa columna
+        friend_name = session.scalar(
+            select(Player.username).where(Player.id == friend_id)
+        )
 
         return jsonify({"message": f"Friend request with {friend_name} accepted"}), 200
 
     except Exception as e:
         return jsonify({"message": str(e)}), 500
 
-    finally:
-        session.close()
-
 
 # RECHAZAR SOLICITUDES
 @friends.route("/friends/deny_request", methods=["DELETE"])
@@ -152,15 +130,12 @@ def deny_requests():
         if not friend_id:
             return jsonify({"message": "friend_id is required"}), 400
 
-        session = SessionLocal()
+        session = get_session()
 
         # Eliminar la solicitud
         session.execute(
             delete(t_friend).where(
-                ((t_friend.c.id1 == player_id) & (t_friend.c.id2 == friend_id))
-                | ((t_friend.c.id1 == friend_id) & (t_friend.c.id2 == player_id))
-                & t_friend.c.approved
-                == 0
+                friendship_key(player_id, friend_id), t_friend.c.approved == 0
             )
         )
         session.commit()
@@ -170,53 +145,69 @@ def deny_requests():
     except Exception as e:
         return jsonify({"message": str(e)}), 500
 
-    finally:
-        session.close()
+
+# Ids de los amigos aprobados del jugador. Cada rama de la unión usa su
+# propio índice (id1 o id2) y devuelve el id del otro jugador; al paginar, el
+# cursor y el límite se aplican dentro de cada rama para no leer la lista
+# completa en cada página.
+def _friend_ids(player_id, after=None, limit=None):
+    branches = []
+    for own, other in (
+        (t_friend.c.id1, t_friend.c.id2),
+        (t_friend.c.id2, t_friend.c.id1),
+    ):
+        branch = select(other.label("friend_id")).where(
+            own == player_id, t_friend.c.approved == 1
+        )
+        if after:
+            branch = branch.where(other > after)
+        if limit:
+            page = branch.order_by(other).limit(limit).subquery()
+            branch = select(page.c.friend_id)
+        branches.append(branch)
+    return union_all(*branches).subquery()
 
 
-# Ver amigos
+# Ver amigos. Sin `limit` ni `after` devuelve la lista completa, como
+# siempre; con cualquiera de los dos responde por páginas con `next`.
 @friends.route("/friends/list", methods=["GET"])
 @jwt_required()
+@cached_response(lambda: [("friends", get_jwt_identity())], etag=True)
 def list_friends():
     try:
         player_id = get_jwt_identity()
-        session = SessionLocal()
-
-        # Buscar todas las relaciones donde el jugador esté en id1 o id2 y approved=1
-        friend_entries = (
-            session.query(t_friend)
-            .filter(
-                ((t_friend.c.id1 == player_id) | (t_friend.c.id2 == player_id)),
-                t_friend.c.approved == 1,
-            )
-            .all()
+        session = get_session()
+
+        paginate = "limit" in request.args or "after" in request.args
+        after = request.args.get("after")
+        limit = None
+        if paginate:
+            limit = request.args.get("limit", DEFAULT_FRIENDS_PAGE, type=int)
+            limit = max(1, min(limit, MAX_FRIENDS_PAGE))
+
+        friend_ids = _friend_ids(player_id, after, limit + 1 if limit else None)
+        query = (
+            select(Player.id, Player.username)
+            .join(friend_ids, Player.id == friend_ids.c.friend_id)
+            .order_by(Player.id)
         )
+        if limit:
+            query = query.limit(limit + 1)
 
-        if not friend_entries:
-            return jsonify({"friends": []}), 200
+        rows = session.execute(query).all()
 
-        friends = []
-        for entry in friend_entries:
-            # El amigo es el que NO es player_id
-            friend_id = entry.id2 if entry.id1 == player_id else entry.id1
-            friend_player = session.query(Player).filter(Player.id == friend_id).first()
+        if not paginate:
+            friends = [{"id": id, "username": username} for id, username in rows]
+            return jsonify({"friends": friends}), 200
 
-            if friend_player:
-                friends.append(
-                    {
-                        "id": friend_player.id,
-                        "username": friend_player.username,
-                    }
-                )
+        friends = [{"id": id, "username": username} for id, username in rows[:limit]]
+        next_cursor = friends[-1]["id"] if len(rows) > limit else None
 
-        return jsonify({"friends": friends}), 200
+        return jsonify({"friends": friends, "next": next_cursor}), 200
 
     except Exception as e:
         return jsonify({"message": str(e)}), 500
 
-    finally:
-        session.close()
-
 
 # Borrar amigo
 @friends.route("/friends/remove", methods=["DELETE"])
@@ -230,17 +221,16 @@ def remove_friend():
         if not friend_id:
             return jsonify({"message": "friend_id is required"}), 400
 
-        session = SessionLocal()
+        session = get_session()
 
         result = session.execute(
             t_friend.delete().where(
-                ((t_friend.c.id1 == player_id) & (t_friend.c.id2 == friend_id))
-                | ((t_friend.c.id1 == friend_id) & (t_friend.c.id2 == player_id)),
-                t_friend.c.approved == 1,
+                friendship_key(player_id, friend_id), t_friend.c.approved == 1
             )
         )
 
         session.commit()
+        invalidate("friends", player_id, friend_id)
 
         if result.rowcount == 0:
             return jsonify({"message": "Friendship not found"}), 404
@@ -249,6 +239,3 @@ def remove_friend():
 
     except Exception as e:
         return jsonify({"message": str(e)}), 500
-
-    finally:
-        session.close()
@@ -0,0 +1,30 @@
+from flask import Blueprint, current_app, jsonify
+
+from config.db import get_pool_metrics
+from helpers.instrumentation import render_prometheus
+from helpers.species_cache import species_cache
+
+metrics = Blueprint("metrics", __name__)
+
+
+# Estado del pool de conexiones (en uso, overflow y espera de checkout)
+@metrics.route("/metrics/pool", methods=["GET"])
+def pool_status():
+    return jsonify(get_pool_metrics()), 200
+
+
+# Versión, tamaño y aciertos/fallos de la caché de especies
+@metrics.route("/metrics/species_cache", methods=["GET"])
+def species_cache_status():
+    return jsonify(species_cache.stats()), 200
+
+
+# Latencia, consultas y tiempo de base por endpoint en formato Prometheus. Los
+# datos por endpoint solo se juntan con METRICS_ENABLED; el pool y la caché de
+# especies siempre se exponen.
+@metrics.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    body = render_prometheus(get_pool_metrics(), species_cache.stats())
+    return current_app.response_class(
+        body, mimetype="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,16 +1,18 @@
 from flask import Blueprint, jsonify, request
-from flask_bcrypt import Bcrypt
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 from helpers.helpers import create_id
+from helpers.passwords import (
+    PasswordHasherBusy,
+    check_password_hash,
+    generate_password_hash,
+)
 from models.models import Player
-from config.db import SessionLocal
+from config.db import close_session, get_session
 from flask_jwt_extended import create_access_token
 import datetime
 
 player = Blueprint("player", __name__)
 
-bcrypt = Bcrypt()
-
 
 # Registrar nuevo usuario
 @player.route("/register", methods=["POST"])
@@ -28,18 +30,20 @@ def register():
     email = email.strip().lower()
 
     try:
-        session = SessionLocal()
-        existingPlayer = (
-            session.query(Player)
-            .filter(or_(Player.email == email, Player.username == username))
-            .first()
-        )
+        # El hash se calcula antes de abrir la sesión: la consulta de
+        # duplicados y el insert quedan juntos en una transacción corta
+        hashed_password = generate_password_hash(password)
+
+        session = get_session()
+        existingPlayer = session.execute(
+            select(Player.id).where(
+                or_(Player.email == email, Player.username == username)
+            )
+        ).first()
 
         if existingPlayer:
             raise FileExistsError("Player already registered")
 
-        hashed_password = bcrypt.generate_password_hash(password)
-
         newPlayer = Player(
             id=id, username=username, email=email, password=hashed_password
         )
@@ -47,12 +51,11 @@ def register():
         session.add(newPlayer)
         session.commit()
         return jsonify({"message": "Player Created"}), 201
+    except PasswordHasherBusy as e:
+        return jsonify({"message": str(e)}), 503
     except Exception as e:
         return jsonify({"message": str(e)}), 400
 
-    finally:
-        session.close()
-
 
 # Login de usuario
 @player.route("/login", methods=["POST"])
@@ -68,12 +71,17 @@ def login():
     email = email.strip().lower()
 
     try:
-        session = SessionLocal()
-        player = session.query(Player).filter(Player.email == email).first()
+        session = get_session()
+        player = session.execute(
+            select(Player.id, Player.password).where(Player.email == email)
+        ).first()
+        # Liberar la conexión antes de comparar el hash
+        close_session()
+
         if not player:
             raise FileNotFoundError("Player not found")
 
-        correctPassword = bcrypt.check_password_hash(
+        correctPassword = check_password_hash(
             pw_hash=player.password, password=password
         )
 
@@ -82,11 +90,9 @@ def login():
 
         expires = datetime.timedelta(hours=2)
         access_token = create_access_token(identity=player.id, expires_delta=expires)
-        session.commit()
         return jsonify({"access_token": access_token}), 200
 
+    except PasswordHasherBusy as e:
+        return jsonify({"message": str(e)}), 503
     except Exception as e:
         return jsonify({"message": str(e)}), 400
-
-    finally:
-        session.close()
@@ -1,55 +1,144 @@
-from flask import Blueprint, jsonify, request
+from datetime import date
+
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    request,
+    stream_with_context,
+)
 from flask_jwt_extended import get_jwt_identity, jwt_required
+from sqlalchemy import select, tuple_
 
-from config.db import SessionLocal
-from models.models import Player, PokemonOwned, PokemonStat
+from config.db import get_session
+from helpers.cache import cached_response, invalidate
+from helpers.species_cache import species_cache
+from models.models import Player, PokemonOwned
 
 
 pokemon_owned = Blueprint("pokemon_owned", __name__)
 
 
+# Paginación por (obtained_at, id): ?limit=N&after=<cursor>; con
+# ?stream=ndjson la colección completa se manda por partes desde un cursor
+# del servidor, sin armarla entera en memoria
+DEFAULT_COLLECTION_PAGE = 100
+MAX_COLLECTION_PAGE = 500
+STREAM_BATCH = 500
+
+
+# Solo las columnas que se devuelven: filas ligeras en lugar de entidades ORM
+OWNED_COLUMNS = (
+    PokemonOwned.id,
+    PokemonOwned.player_id,
+    PokemonOwned.pokedex_number,
+    PokemonOwned.in_team,
+    PokemonOwned.obtained_at,
+    PokemonOwned.mote,
+)
+
+
+def _collection_cursor(owned):
+    return f"{owned.obtained_at.isoformat()}_{owned.id}"
+
+
+def _apply_cursor(query, after):
+    obtained_at, _, pokemon_id = after.partition("_")
+    return query.filter(
+        tuple_(PokemonOwned.obtained_at, PokemonOwned.id)
+        > tuple_(date.fromisoformat(obtained_at), pokemon_id)
+    )
+
+
+def _stream_collection(query, to_json):
+    dumps = current_app.json.dumps
+
+    def generate():
+        for row in query.yield_per(STREAM_BATCH):
+            yield dumps(to_json(row)) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+def _collection_page(query, to_json):
+    limit = request.args.get("limit", DEFAULT_COLLECTION_PAGE, type=int)
+    limit = max(1, min(limit, MAX_COLLECTION_PAGE))
+
+    rows = query.limit(limit + 1).all()
+    page = rows[:limit]
+
+    response = jsonify([to_json(row) for row in page])
+    if len(rows) > limit:
+        response.headers["X-Next-Cursor"] = _collection_cursor(page[-1])
+    return response
+
+
+# El nombre sale de la caché de especies en lugar de un JOIN con pokemon_stat
+def _owned_json(data):
+    return {
+        "name": species_cache.name(data.pokedex_number),
+        "id": data.id,
+        "player_id": data.player_id,
+        "pokedex_number": data.pokedex_number,
+        "in_team": data.in_team,
+        "obtained_at": data.obtained_at,
+        "mote": data.mote,
+    }
+
+
+def _public_json(owned, username):
+    return {
+        "id": owned.id,
+        "name": species_cache.name(owned.pokedex_number),
+        "owner": username,
+        "pokedex_number": owned.pokedex_number,
+        "in_team": owned.in_team,
+        "obtained_at": owned.obtained_at,
+        "mote": owned.mote,
+    }
+
+
 # Usuario loggeado
 @pokemon_owned.route("/pokemon/users_pokemon", methods=["GET"])
 @jwt_required()
+@cached_response(lambda: [("pokemon", get_jwt_identity())], etag=True)
 def get_all_owned():
     player_id = get_jwt_identity()
     try:
-        session = SessionLocal()
+        session = get_session()
 
-        pokemon_owned_json = []
-        all_pokemon_owned = (
-            session.query(PokemonOwned, PokemonStat.name)
-            .join(
-                PokemonStat, PokemonStat.pokedex_number == PokemonOwned.pokedex_number
-            )
+        query = (
+            session.query(*OWNED_COLUMNS)
             .filter(PokemonOwned.player_id == player_id)
-            .all()
+            .order_by(PokemonOwned.obtained_at, PokemonOwned.id)
         )
 
+        after = request.args.get("after")
+        if after:
+            try:
+                query = _apply_cursor(query, after)
+            except ValueError:
+                return jsonify({"message": "Invalid cursor"}), 400
+
+        if request.args.get("stream") == "ndjson":
+            return _stream_collection(query, _owned_json)
+
+        if "limit" in request.args or after:
+            return _collection_page(query, _owned_json), 200
+
+        all_pokemon_owned = query.all()
+
         if not all_pokemon_owned:
             raise ValueError("No pokemon owned")
 
-        for data, name in all_pokemon_owned:
-            pokemon_owned_json.append(
-                {
-                    "name": name,
-                    "id": data.id,
-                    "player_id": data.player_id,
-                    "pokedex_number": data.pokedex_number,
-                    "in_team": data.in_team,
-                    "obtained_at": data.obtained_at,
-                    "mote": data.mote,
-                }
-            )
+        pokemon_owned_json = [_owned_json(data) for data in all_pokemon_owned]
 
         return jsonify(pokemon_owned_json), 200
 
     except Exception as e:
         return jsonify({"message": str(e)}), 500
 
-    finally:
-        session.close()
-
 
 @pokemon_owned.route(
     "/pokemon/users_pokemon/<string:owned_pokemon_id>", methods=["GET"]
@@ -58,28 +147,24 @@ def get_all_owned():
 def get_my_pokemon(owned_pokemon_id):
     try:
         player_id = get_jwt_identity()
-        session = SessionLocal()
+        session = get_session()
 
-        pokemon_entry = (
-            session.query(PokemonOwned, PokemonStat.name)
-            .join(
-                PokemonStat, PokemonStat.pokedex_number == PokemonOwned.pokedex_number
-            )
+        data = (
+            session.query(*OWNED_COLUMNS)
             .filter(
                 PokemonOwned.id == owned_pokemon_id, PokemonOwned.player_id == player_id
             )
             .first()
         )
-        if not pokemon_entry:
+        if not data:
             return (
                 jsonify({"message": "Pokemon not found or doesn't belong to you"}),
                 404,
             )
 
-        data, name = pokemon_entry
         pokemon_json = {
             "id": data.id,
-            "name": name,
+            "name": species_cache.name(data.pokedex_number),
             "player_id": data.player_id,
             "pokedex_number": data.pokedex_number,
             "in_team": data.in_team,
@@ -90,9 +175,6 @@ def get_my_pokemon(owned_pokemon_id):
     except Exception as e:
         return jsonify({"message": str(e)}), 500
 
-    finally:
-        session.close()
-
 
 @pokemon_owned.route(
     "/pokemon/public_users_pokemon/<string:player_id>", methods=["GET"]
@@ -100,17 +182,35 @@ def get_my_pokemon(owned_pokemon_id):
 @jwt_required()
 def other_player_pokemon(player_id):
     try:
-        session = SessionLocal()
+        session = get_session()
 
-        all_pokemon = (
-            session.query(PokemonOwned, PokemonStat.name, Player.username)
-            .join(
-                PokemonStat, PokemonStat.pokedex_number == PokemonOwned.pokedex_number
-            )
-            .join(Player, Player.id == PokemonOwned.player_id)
+        username = session.execute(
+            select(Player.username).where(Player.id == player_id)
+        ).scalar()
+
+        def to_json(owned):
+            return _public_json(owned, username)
+
+        query = (
+            session.query(*OWNED_COLUMNS)
             .filter(PokemonOwned.player_id == player_id)
-            .all()
+            .order_by(PokemonOwned.obtained_at, PokemonOwned.id)
         )
+
+        after = request.args.get("after")
+        if after:
+            try:
+                query = _apply_cursor(query, after)
+            except ValueError:
+                return jsonify({"message": "Invalid cursor"}), 400
+
+        if request.args.get("stream") == "ndjson":
+            return _stream_collection(query, to_json)
+
+        if "limit" in request.args or after:
+            return _collection_page(query, to_json), 200
+
+        all_pokemon = query.all()
         if not all_pokemon:
             return (
                 jsonify(
@@ -119,30 +219,16 @@ def other_player_pokemon(player_id):
                 404,
             )
 
-        all_pokemon_json = []
-        for owned, name, username in all_pokemon:
-            all_pokemon_json.append(
-                {
-                    "id": owned.id,
-                    "name": name,
-                    "owner": username,
-                    "pokedex_number": owned.pokedex_number,
-                    "in_team": owned.in_team,
-                    "obtained_at": owned.obtained_at,
-                    "mote": owned.mote,
-                }
-            )
+        all_pokemon_json = [to_json(owned) for owned in all_pokemon]
         return jsonify(all_pokemon_json), 200
     except Exception as e:
         return jsonify({"message": str(e)}), 500
-    finally:
-        session.close()
 
 
 @pokemon_owned.route("/pokemon/change_mote", methods=["PUT"])
 @jwt_required()
 def change_mote():
-    session = SessionLocal()
+    session = get_session()
     try:
         data = request.get_json()
 
@@ -165,12 +251,11 @@ def change_mote():
         pokemon_data.mote = mote
 
         session.commit()
+        invalidate("pokemon", player_id)
         return jsonify({"message": "Changed mote"}), 201
 
     except Exception as e:
         return jsonify({"message": str(e)}), 500
-    finally:
-        session.close()
 
 
 @pokemon_owned.route("/pokemon/delete", methods=["DELETE"])
@@ -184,7 +269,7 @@ def transfer_to_box():
         if not pokemon_id:
             return jsonify({"message": "Pokemon_id not valid"}), 406
 
-        session = SessionLocal()
+        session = get_session()
 
         players_pokemon = (
             session.query(PokemonOwned)
@@ -200,6 +285,7 @@ def transfer_to_box():
 
         session.delete(players_pokemon)
         session.commit()
+        invalidate("pokemon", player_id)
 
         return (
             jsonify(
@@ -212,6 +298,3 @@ def transfer_to_box():
 
     except Exception as e:
         return jsonify({"message": str(e)}), 500
-
-    finally:
-        session.close()
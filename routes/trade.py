@@ -1,9 +1,14 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
 
-from config.db import SessionLocal
+from sqlalchemy import case, or_, select, update
+from sqlalchemy.orm import aliased
+
+from config.db import get_session
+from helpers.auth import player_exists
+from helpers.cache import cached_response, invalidate
+from helpers.ids import uuid7
 from models.models import Trade, TradeStatus, Player, PokemonOwned
-import uuid
 from datetime import datetime
 
 trade = Blueprint("trade", __name__)
@@ -11,12 +16,24 @@ trade = Blueprint("trade", __name__)
 
 @trade.route("/trade/<string:friend_id>", methods=["GET"])
 @jwt_required()
+@cached_response(
+    lambda friend_id: [("trades", get_jwt_identity()), ("trades", friend_id)]
+)
 def get_requests_specific(friend_id):
     trainer_id = get_jwt_identity()
-    session = SessionLocal()
+    session = get_session()
     try:
         trades = (
-            session.query(Trade)
+            session.query(
+                Trade.id,
+                Trade.requester_id,
+                Trade.receiver_id,
+                Trade.requester_pokemon_id,
+                Trade.receiver_pokemon_id,
+                Trade.status,
+                Trade.created_at,
+                Trade.decided_at,
+            )
             .filter(
                 ((Trade.requester_id == trainer_id) & (Trade.receiver_id == friend_id))
                 | (
@@ -30,26 +47,10 @@ def get_requests_specific(friend_id):
         if not trades:
             return jsonify({"message": "No pending trades with that friend"}), 404
 
-        trades_json = []
-        for t in trades:
-            trades_json.append(
-                {
-                    "id": t.id,
-                    "requester_id": t.requester_id,
-                    "receiver_id": t.receiver_id,
-                    "requester_pokemon_id": t.requester_pokemon_id,
-                    "receiver_pokemon_id": t.receiver_pokemon_id,
-                    "status": t.status.value,
-                    "created_at": t.created_at,
-                    "decided_at": t.decided_at,
-                }
-            )
-
-        return jsonify(trades_json), 200
+        # Filas de columnas; el proveedor JSON las serializa directamente
+        return jsonify(trades), 200
     except Exception as e:
         return jsonify({"message": str(e)}), 500
-    finally:
-        session.close()
 
 
 # Mandar un petición de intercambio
@@ -65,10 +66,13 @@ def request_pokemon():
     if not friend_id or not requester_pokemon_id or not receiver_pokemon_id:
         return jsonify({"message": "Parameters missing"}), 400
 
-    session = SessionLocal()
+    session = get_session()
     try:
+        if not player_exists(session, friend_id):
+            return jsonify({"message": "That Player does not exist"}), 404
+
         trade = Trade(
-            id=str(uuid.uuid4()),
+            id=uuid7(),
             requester_id=player_id,
             receiver_id=friend_id,
             requester_pokemon_id=requester_pokemon_id,
@@ -79,14 +83,12 @@ def request_pokemon():
 
         session.add(trade)
         session.commit()
+        invalidate("trades", player_id, friend_id)
         return jsonify({"message": "Trade Request created"}), 201
 
     except Exception as e:
         return jsonify({"message": str(e)}), 500
 
-    finally:
-        session.close()
-
 
 # Confirmando el intercambio de pokemon
 @trade.route("/trade/confirm", methods=["POST"])
@@ -99,14 +101,34 @@ def confirm_request():
     if not trade_id:
         return jsonify({"message": "Trade_id is neccesary for this method"}), 400
 
-    session = SessionLocal()
+    session = get_session()
 
     try:
-        trade = session.query(Trade).filter(Trade.id == trade_id).first()
+        # Un solo SELECT ... FOR UPDATE bloquea el intercambio y los dos Pokemon
+        # hasta el commit, así no se cruza con otra confirmación o un borrado
+        requester_pokemon = aliased(PokemonOwned)
+        receiver_pokemon = aliased(PokemonOwned)
+        locked = session.execute(
+            select(
+                Trade,
+                requester_pokemon.player_id.label("requester_owner"),
+                receiver_pokemon.player_id.label("receiver_owner"),
+            )
+            .outerjoin(
+                requester_pokemon, requester_pokemon.id == Trade.requester_pokemon_id
+            )
+            .outerjoin(
+                receiver_pokemon, receiver_pokemon.id == Trade.receiver_pokemon_id
+            )
+            .where(Trade.id == trade_id)
+            .with_for_update()
+        ).first()
 
-        if not trade:
+        if not locked:
             return jsonify({"message": "That pending trade doesn't exist"}), 404
 
+        trade, requester_owner, receiver_owner = locked
+
         if trade.receiver_id != player_id:
             return (
                 jsonify({"message": "You are not authorized to confirm this trade"}),
@@ -116,32 +138,66 @@ def confirm_request():
         if trade.status != TradeStatus.pending:
             return jsonify({"message": "Trade already decided"}), 400
 
-        trade.status = TradeStatus.accepted
-        trade.decided_at = datetime.now()
-
-        requester_pokemon = (
-            session.query(PokemonOwned)
-            .filter(PokemonOwned.id == trade.requester_pokemon_id)
-            .first()
-        )
-        receiver_pokemon = (
-            session.query(PokemonOwned)
-            .filter(PokemonOwned.id == trade.receiver_pokemon_id)
-            .first()
-        )
-
-        if not requester_pokemon or not receiver_pokemon:
+        if requester_owner is None or receiver_owner is None:
             return (
                 jsonify({"message": "One of the Pokémon in this trade does not exist"}),
                 404,
             )
 
-        requester_pokemon.player_id, receiver_pokemon.player_id = (
-            receiver_pokemon.player_id,
-            requester_pokemon.player_id,
+        if (
+            requester_owner != trade.requester_id
+            or receiver_owner != trade.receiver_id
+        ):
+            return (
+                jsonify({"message": "One of the Pokémon in this trade changed owner"}),
+                409,
+            )
+
+        pokemon_ids = [trade.requester_pokemon_id, trade.receiver_pokemon_id]
+
+        # Intercambiar dueños en un solo UPDATE
+        session.execute(
+            update(PokemonOwned)
+            .where(PokemonOwned.id.in_(pokemon_ids))
+            .values(
+                player_id=case(
+                    (
+                        PokemonOwned.id == trade.requester_pokemon_id,
+                        trade.receiver_id,
+                    ),
+                    else_=trade.requester_id,
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        # Aceptar este intercambio y rechazar los pendientes que usen
+        # cualquiera de los dos Pokemon
+        session.execute(
+            update(Trade)
+            .where(
+                Trade.status == TradeStatus.pending,
+                or_(
+                    Trade.id == trade_id,
+                    Trade.requester_pokemon_id.in_(pokemon_ids),
+                    Trade.receiver_pokemon_id.in_(pokemon_ids),
+                ),
+            )
+            .values(
+                status=case(
+                    (Trade.id == trade_id, TradeStatus.accepted.name),
+                    else_=TradeStatus.rejected.name,
+                ),
+                decided_at=datetime.now(),
+            )
+            .execution_options(synchronize_session=False)
         )
 
+        # Los atributos de `trade` expiran con el commit
+        parties = (trade.requester_id, trade.receiver_id)
         session.commit()
+        invalidate("pokemon", *parties)
+        invalidate("trades", *parties)
 
         return (
             jsonify(
@@ -154,8 +210,6 @@ def confirm_request():
     except Exception as e:
         session.rollback()
         return jsonify({"message": str(e)}), 500
-    finally:
-        session.close()
 
 
 # Denegando el intercambio de Pokemon
@@ -169,7 +223,7 @@ def deny_request():
     if not trade_id:
         return jsonify({"message": "Trade_id is neccesary for this method"}), 400
 
-    session = SessionLocal()
+    session = get_session()
 
     try:
         trade = session.query(Trade).filter(Trade.id == trade_id).first()
@@ -189,7 +243,9 @@ def deny_request():
         trade.status = TradeStatus.rejected
         trade.decided_at = datetime.now()
 
+        parties = (trade.requester_id, trade.receiver_id)
         session.commit()
+        invalidate("trades", *parties)
 
         return (
             jsonify({"message": f"Trade with id: {trade_id} has been denied"}),
@@ -198,5 +254,3 @@ def deny_request():
     except Exception as e:
         session.rollback()
         return jsonify({"message": str(e)}), 500
-    finally:
-        session.close()
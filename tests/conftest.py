@@ -0,0 +1,117 @@
+import os
+import tempfile
+import threading
+
+import pytest
+
+# La configuración se lee al importar config.db. Por defecto las pruebas usan
+# una base SQLite temporal; con TEST_DB_URL corren contra esa MySQL, que se
+# borra y recrea en cada prueba (usar una base desechable).
+_tmpdir = tempfile.mkdtemp(prefix="pocket_rivals_tests_")
+os.environ["DB_URL"] = os.getenv("TEST_DB_URL") or (
+    f"sqlite:///{os.path.join(_tmpdir, 'test.db')}"
+)
+os.environ.setdefault("JWT_SECRET", "test-secret-key-with-enough-length-32")
+os.environ.setdefault("BCRYPT_LOG_ROUNDS", "4")
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+
+# SQLite reemplaza a MySQL con los ajustes de config/sqlite.py. Los bloqueos
+# FOR UPDATE y la semántica de UPDATE de MySQL solo se prueban con
+# TEST_DB_URL (ver mysql_only).
+mysql_only = pytest.mark.skipif(
+    not os.getenv("TEST_DB_URL"),
+    reason="needs a MySQL server in TEST_DB_URL",
+)
+
+
+# Ejecuta cada llamada en su propio hilo con su test client; una barrera las
+# suelta juntas. Devuelve los status en el orden de `calls`.
+def concurrently(app, calls):
+    barrier = threading.Barrier(len(calls))
+    statuses = [None] * len(calls)
+
+    def run(index, call):
+        client = app.test_client()
+        barrier.wait()
+        statuses[index] = call(client).status_code
+
+    threads = [
+        threading.Thread(target=run, args=(index, call))
+        for index, call in enumerate(calls)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return statuses
+
+
+@pytest.fixture
+def app(monkeypatch):
+    from app import create_app
+    from config.db import get_engine
+    from helpers import auth, cache
+    from helpers.species_cache import species_cache
+    from models.models import Base
+
+    engine = get_engine()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    # Cachés de proceso limpias en cada prueba
+    monkeypatch.setattr(cache, "cache", cache.LocalCache())
+    monkeypatch.setattr(auth, "_known_players", cache.LocalCache())
+    species_cache.invalidate()
+
+    return create_app({"TESTING": True, "PRELOAD_SPECIES": False})
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def db_session(app):
+    from config.db import SessionLocal
+
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def auth(app):
+    def headers(player_id):
+        with app.app_context():
+            token = create_access_token(identity=player_id)
+        return {"Authorization": f"Bearer {token}"}
+
+    return headers
+
+
+# Cuenta las sentencias SQL que se ejecutan dentro del bloque `with`
+@pytest.fixture
+def count_queries(app):
+    from contextlib import contextmanager
+
+    from config.db import get_engine
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = get_engine()
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return counter
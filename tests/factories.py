@@ -0,0 +1,70 @@
+import datetime
+
+from sqlalchemy import insert
+
+from models.models import Player, PokemonOwned, PokemonStat, t_friend
+
+
+def add_species(session, rates=(45, 45, 255)):
+    session.execute(
+        insert(PokemonStat),
+        [
+            {
+                "pokedex_number": number,
+                "name": f"species{number}",
+                "type1": "normal",
+                "capture_rate": rate,
+            }
+            for number, rate in enumerate(rates, start=1)
+        ],
+    )
+    session.commit()
+
+
+def add_players(session, *player_ids, password="-"):
+    session.execute(
+        insert(Player),
+        [
+            {
+                "id": player_id,
+                "username": player_id[:20],
+                "email": f"{player_id}@example.com",
+                "password": password,
+            }
+            for player_id in player_ids
+        ],
+    )
+    session.commit()
+
+
+def add_friends(session, player_id, *friend_ids, approved=1):
+    session.execute(
+        insert(t_friend),
+        [
+            {
+                "id1": player_id,
+                "id2": friend_id,
+                "approved": approved,
+                "petitioner": player_id,
+            }
+            for friend_id in friend_ids
+        ],
+    )
+    session.commit()
+
+
+def add_pokemon(session, player_id, *owned_ids, pokedex_number=1):
+    session.execute(
+        insert(PokemonOwned),
+        [
+            {
+                "id": owned_id,
+                "player_id": player_id,
+                "pokedex_number": pokedex_number,
+                "in_team": 0,
+                "obtained_at": datetime.date(2026, 1, 1),
+            }
+            for owned_id in owned_ids
+        ],
+    )
+    session.commit()
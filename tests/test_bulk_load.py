@@ -0,0 +1,97 @@
+import datetime
+import random
+
+import pytest
+from sqlalchemy import event, func, select, text
+
+from config.db import get_engine
+from helpers import bulk_load
+from models.models import Player
+
+
+def _players():
+    return [
+        {
+            "id": f"p{i}",
+            "username": f"p{i}",
+            "email": f"p{i}@example.com",
+            "password": "-",
+        }
+        for i in range(3)
+    ]
+
+
+def test_write_csv_uses_lf(tmp_path):
+    path = tmp_path / "player.csv"
+    assert bulk_load.write_csv(path, [_players()[:2], [], _players()[2:]]) == 3
+
+    data = path.read_bytes()
+    assert b"\r" not in data
+    assert data.count(b"\n") == 4
+
+
+def test_csv_roundtrip(tmp_path):
+    path = tmp_path / "pokemon_owned.csv"
+    rows = [
+        {
+            "id": "abc",
+            "player_id": "p0",
+            "pokedex_number": 25,
+            "in_team": 1,
+            "obtained_at": datetime.date(2026, 1, 2),
+            "mote": "",
+        }
+    ]
+    bulk_load.write_csv(path, [rows])
+
+    table = bulk_load.get_table("pokemon_owned")
+    [batch] = bulk_load.read_csv(path, table)
+    assert batch == [{**rows[0], "mote": None}]
+
+
+def test_load_data_line_terminator(tmp_path):
+    table = bulk_load.get_table("player")
+    lf = tmp_path / "lf.csv"
+    bulk_load.write_csv(lf, [_players()])
+    crlf = tmp_path / "crlf.csv"
+    crlf.write_bytes(lf.read_bytes().replace(b"\n", b"\r\n"))
+
+    assert "LINES TERMINATED BY '\\n'" in bulk_load.load_data_statement(table, lf).text
+    assert "LINES TERMINATED BY '\\r\\n'" in (
+        bulk_load.load_data_statement(table, crlf).text
+    )
+
+
+def test_friend_pairs_mean_degree():
+    players = 5000
+    for mean_degree in (4, 10):
+        pairs = bulk_load.friend_pairs(players, mean_degree, random.Random(1))
+        assert all(a < b for a, b in pairs)
+        assert 2 * len(pairs) / players == pytest.approx(mean_degree, rel=0.1)
+
+
+# Las verificaciones apagadas con SET SESSION no pueden quedar en otra
+# conexión del pool: toda la carga usa una sola conexión
+def test_bulk_insert_pins_one_connection(app, db_session, monkeypatch):
+    monkeypatch.setattr(bulk_load, "_SKIP_CHECKS", text("PRAGMA foreign_keys = OFF"))
+    monkeypatch.setattr(bulk_load, "_RESTORE_CHECKS", text("PRAGMA foreign_keys = ON"))
+    checkouts = []
+    pool = get_engine().pool
+
+    def listener(dbapi_connection, record, proxy):
+        checkouts.append(dbapi_connection)
+
+    event.listen(pool, "checkout", listener)
+    try:
+        players = _players()
+        result = bulk_load.bulk_insert(
+            bulk_load.get_table("player"),
+            [players[:1], players[1:2], players[2:]],
+            skip_checks=True,
+        )
+    finally:
+        event.remove(pool, "checkout", listener)
+
+    assert result.rows == 3
+    assert len(checkouts) == 1
+    assert db_session.scalar(select(func.count()).select_from(Player)) == 3
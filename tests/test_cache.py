@@ -0,0 +1,116 @@
+import hashlib
+
+import pytest
+
+from helpers import cache
+from tests.factories import add_players, add_pokemon, add_species
+
+
+@pytest.fixture(params=["local", "redis"])
+def backend(request, app, monkeypatch):
+    if request.param == "local":
+        backend = cache.LocalCache()
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        backend = cache.RedisCache(client=fakeredis.FakeRedis())
+    monkeypatch.setattr(cache, "cache", backend)
+    return backend
+
+
+@pytest.fixture
+def player(db_session):
+    add_species(db_session)
+    add_players(db_session, "ash")
+    add_pokemon(db_session, "ash", "p1", "p2", "p3")
+    return "ash"
+
+
+def _ids(response):
+    return [pokemon["id"] for pokemon in response.get_json()]
+
+
+def test_backend_roundtrip(backend):
+    backend.set("key", b"value")
+    assert backend.get("key") == b"value"
+    backend.delete("key", "missing")
+    assert backend.get("key") is None
+
+
+def test_version_tokens_expire(backend, app):
+    with app.test_request_context():
+        cache.scope_version("pokemon", "ash")
+
+    key = cache._version_key("pokemon", "ash")
+    if isinstance(backend, cache.LocalCache):
+        _, expires_at = backend._entries[key]
+        assert expires_at is not None
+    else:
+        assert 0 < backend._client.ttl(key) <= cache.CACHE_TTL
+
+
+def test_cached_page_keeps_cursor_header(client, auth, backend, player):
+    headers = auth(player)
+    first = client.get("/pokemon/users_pokemon?limit=2", headers=headers)
+    second = client.get("/pokemon/users_pokemon?limit=2", headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert _ids(second) == _ids(first) == ["p1", "p2"]
+    assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+
+
+def test_invalidate_drops_cached_response(client, db_session, auth, backend, player):
+    headers = auth(player)
+    before = client.get("/pokemon/users_pokemon", headers=headers)
+    client.delete("/pokemon/delete", headers=headers, json={"pokemon_id": "p1"})
+    after = client.get("/pokemon/users_pokemon", headers=headers)
+
+    assert len(after.get_json()) == len(before.get_json()) - 1
+    assert after.headers["ETag"] != before.headers["ETag"]
+
+
+def test_etag_not_modified(client, auth, backend, player):
+    headers = auth(player)
+    etag = client.get("/pokemon/users_pokemon", headers=headers).headers["ETag"]
+
+    response = client.get(
+        "/pokemon/users_pokemon", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+def test_incomplete_backend_fails_on_creation():
+    class GetOnly(cache.CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
+
+
+def test_create_cache():
+    # Sin CACHE_URL no hay caché, aunque el proceso sea uno solo
+    assert cache.create_cache("") is None
+    assert isinstance(cache.create_cache("local"), cache.LocalCache)
+    assert isinstance(cache.create_cache("redis://localhost:6379/0"), cache.RedisCache)
+    with pytest.raises(ValueError):
+        cache.create_cache("memcached://localhost")
+
+
+# Sin caché compartida el ETag sale del cuerpo: cualquier worker responde igual
+def test_without_shared_cache_etag_follows_body(
+    client, db_session, auth, monkeypatch, player
+):
+    monkeypatch.setattr(cache, "cache", None)
+    headers = auth(player)
+
+    response = client.get("/pokemon/users_pokemon", headers=headers)
+    etag = response.headers["ETag"]
+    assert etag == f'"{hashlib.sha1(response.get_data()).hexdigest()}"'
+
+    conditional = {**headers, "If-None-Match": etag}
+    assert client.get("/pokemon/users_pokemon", headers=conditional).status_code == 304
+
+    client.delete("/pokemon/delete", headers=headers, json={"pokemon_id": "p1"})
+    response = client.get("/pokemon/users_pokemon", headers=conditional)
+    assert response.status_code == 200
+    assert _ids(response) == ["p2", "p3"]
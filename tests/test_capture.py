@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import func, select
+
+from helpers.capture_sampler import capture_sampler
+from models.models import PokeballHistory, PokemonOwned
+from routes import capture
+from tests.factories import add_players, add_species
+
+
+def _owned(session, player_id):
+    return session.scalar(
+        select(func.count())
+        .select_from(PokemonOwned)
+        .where(PokemonOwned.player_id == player_id)
+    )
+
+
+@pytest.fixture
+def player(db_session):
+    add_species(db_session)
+    add_players(db_session, "ash")
+    return "ash"
+
+
+def test_capture_writes_pokemon_and_history(client, db_session, auth, player):
+    response = client.get("/capture_pokemon", headers=auth(player))
+
+    assert response.status_code == 201
+    assert _owned(db_session, player) == 1
+    assert db_session.scalar(select(func.count()).select_from(PokeballHistory)) == 1
+
+
+def test_batch_capture(client, db_session, auth, player):
+    response = client.post(
+        "/capture_pokemon/batch", headers=auth(player), json={"count": 3}
+    )
+
+    assert response.status_code == 201
+    assert len(response.get_json()["captured"]) == 3
+    assert _owned(db_session, player) == 3
+
+
+@pytest.mark.parametrize("count", [0, -1, True, "2", capture.MAX_CAPTURE_BATCH + 1])
+def test_batch_rejects_bad_counts(client, auth, player, count):
+    response = client.post(
+        "/capture_pokemon/batch", headers=auth(player), json={"count": count}
+    )
+    assert response.status_code == 400
+
+
+# El tope de Pokemon por jugador aplica en las dos rutas de captura
+def test_owned_cap_applies_to_single_capture(
+    client, db_session, auth, player, monkeypatch
+):
+    monkeypatch.setattr(capture, "MAX_POKEMON_OWNED", 2)
+
+    statuses = [
+        client.get("/capture_pokemon", headers=auth(player)).status_code
+        for _ in range(3)
+    ]
+
+    assert statuses == [201, 201, 409]
+    assert _owned(db_session, player) == 2
+
+
+def test_owned_cap_applies_to_batch_capture(
+    client, db_session, auth, player, monkeypatch
+):
+    monkeypatch.setattr(capture, "MAX_POKEMON_OWNED", 4)
+    headers = auth(player)
+
+    assert client.get("/capture_pokemon", headers=headers).status_code == 201
+    response = client.post(
+        "/capture_pokemon/batch", headers=headers, json={"count": 4}
+    )
+
+    assert response.status_code == 409
+    assert _owned(db_session, player) == 1
+
+
+def test_capture_for_missing_player(client, auth, player, monkeypatch):
+    monkeypatch.setattr(capture, "MAX_POKEMON_OWNED", 5)
+    response = client.get("/capture_pokemon", headers=auth("nobody"))
+    assert response.status_code == 404
+
+
+# Arranque con pokemon_stat vacío: la carga vacía no queda en caché por el TTL
+def test_capture_after_species_loaded_late(client, db_session, auth):
+    add_players(db_session, "ash")
+    with pytest.raises(ValueError):
+        capture_sampler.reload()
+    assert client.get("/capture_pokemon", headers=auth("ash")).status_code == 500
+
+    add_species(db_session)
+
+    assert client.get("/capture_pokemon", headers=auth("ash")).status_code == 201
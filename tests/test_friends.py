@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import update
+
+from models.models import Player
+from tests.factories import add_friends, add_players
+
+FRIENDS = 150
+
+
+@pytest.fixture
+def popular(db_session):
+    # Amigos repartidos entre id1 e id2 para cubrir las dos ramas de la unión
+    others = [f"f{i:03d}" for i in range(FRIENDS)]
+    add_players(db_session, "ash", "stranger", "pending", *others)
+    add_friends(db_session, "ash", *others[::2])
+    for other in others[1::2]:
+        add_friends(db_session, other, "ash")
+    add_friends(db_session, "ash", "pending", approved=0)
+    return others
+
+
+# Regresión N+1: la lista sale en una sola consulta sin importar su tamaño
+def test_list_is_one_query(client, auth, popular, count_queries):
+    headers = auth("ash")
+    with count_queries() as statements:
+        response = client.get("/friends/list", headers=headers)
+
+    assert response.status_code == 200
+    assert len(statements) == 1
+
+
+def test_unpaginated_list_returns_everyone(client, auth, popular):
+    body = client.get("/friends/list", headers=auth("ash")).get_json()
+
+    assert body == {
+        "friends": [{"id": other, "username": other} for other in popular]
+    }
+
+
+def test_pages_walk_the_whole_list(client, auth, popular, count_queries):
+    headers = auth("ash")
+    seen = []
+    after = ""
+    with count_queries() as statements:
+        while after is not None:
+            body = client.get(
+                f"/friends/list?limit=40&after={after}", headers=headers
+            ).get_json()
+            assert len(body["friends"]) <= 40
+            seen.extend(friend["id"] for friend in body["friends"])
+            after = body["next"]
+
+    assert seen == popular
+    assert len(statements) == 4
+
+
+def test_limit_without_after(client, auth, popular):
+    body = client.get("/friends/list?limit=10", headers=auth("ash")).get_json()
+
+    assert [friend["id"] for friend in body["friends"]] == popular[:10]
+    assert body["next"] == popular[9]
+
+
+def test_player_without_friends(client, auth, popular):
+    body = client.get("/friends/list", headers=auth("stranger")).get_json()
+    assert body == {"friends": []}
+
+
+# El mensaje usa el nombre de usuario de quien envió la solicitud, no su id
+def test_accept_request_names_the_friend(client, db_session, auth, popular):
+    db_session.execute(update(Player).where(Player.id == "ash").values(username="Ash"))
+    db_session.commit()
+
+    response = client.post(
+        "/friends/accept_request", headers=auth("pending"), json={"friend_id": "ash"}
+    )
+
+    assert response.status_code == 200
+    assert response.get_json() == {"message": "Friend request with Ash accepted"}
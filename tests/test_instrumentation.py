@@ -0,0 +1,31 @@
+import pytest
+
+from helpers import instrumentation
+
+
+@pytest.fixture
+def should_profile(app, monkeypatch):
+    monkeypatch.setattr(instrumentation, "PROFILE_ENABLED", True)
+    monkeypatch.setattr(instrumentation, "PROFILE_SAMPLE_RATE", 0)
+
+    def check(headers):
+        with app.test_request_context(headers=headers):
+            return instrumentation._should_profile()
+
+    return check
+
+
+def test_profile_header_needs_the_token(should_profile, monkeypatch):
+    monkeypatch.setattr(instrumentation, "PROFILE_TOKEN", "s3cret")
+
+    assert should_profile({"X-Profile": "s3cret"})
+    assert not should_profile({"X-Profile": "1"})
+    assert not should_profile({"X-Profile": "s3crét"})
+    assert not should_profile({})
+
+
+def test_profile_header_ignored_without_token(should_profile, monkeypatch):
+    monkeypatch.setattr(instrumentation, "PROFILE_TOKEN", "")
+
+    assert not should_profile({"X-Profile": "1"})
+    assert not should_profile({"X-Profile": ""})
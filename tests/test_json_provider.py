@@ -0,0 +1,61 @@
+import datetime
+
+import pytest
+from sqlalchemy import insert
+
+from helpers import json_provider
+from models.models import Trade, TradeStatus
+from tests.factories import add_friends, add_players, add_pokemon, add_species
+
+
+@pytest.fixture(params=["stdlib", "orjson"])
+def provider(request, app):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+        app.json = json_provider.OrjsonProvider(app)
+    else:
+        app.json = json_provider.RowJSONProvider(app)
+    return app.json
+
+
+def test_enum_and_dates(provider):
+    obj = {
+        "status": TradeStatus.pending,
+        "created_at": datetime.datetime(2026, 1, 2, 3, 4, 5),
+    }
+    assert provider.loads(provider.dumps(obj)) == {
+        "status": "pending",
+        "created_at": "Fri, 02 Jan 2026 03:04:05 GMT",
+    }
+
+
+def test_unknown_type_raises(provider):
+    with pytest.raises(TypeError):
+        provider.dumps({"value": object()})
+
+
+def test_pending_trades_serialize_rows(client, db_session, auth, provider):
+    add_species(db_session)
+    add_players(db_session, "ash", "misty")
+    add_friends(db_session, "ash", "misty")
+    add_pokemon(db_session, "ash", "ash_pika")
+    add_pokemon(db_session, "misty", "misty_star")
+    db_session.execute(
+        insert(Trade),
+        {
+            "id": "t1",
+            "requester_id": "ash",
+            "receiver_id": "misty",
+            "requester_pokemon_id": "ash_pika",
+            "receiver_pokemon_id": "misty_star",
+            "status": TradeStatus.pending,
+        },
+    )
+    db_session.commit()
+
+    response = client.get("/trade/misty", headers=auth("ash"))
+
+    assert response.status_code == 200
+    [trade] = response.get_json()
+    assert trade["id"] == "t1"
+    assert trade["status"] == "pending"
@@ -0,0 +1,81 @@
+import os
+import time
+
+import pytest
+from flask import g
+
+from helpers import passwords
+from helpers.passwords import PasswordHasherBusy
+from routes import players
+
+NEW_PLAYER = {"username": "misty", "email": "Misty@Example.com", "password": "pw"}
+
+
+def test_register_and_login(client):
+    assert client.post("/register", json=NEW_PLAYER).status_code == 201
+
+    response = client.post(
+        "/login", json={"email": "misty@example.com", "password": "pw"}
+    )
+    assert response.status_code == 200
+    assert response.get_json()["access_token"]
+
+
+def test_register_rejects_duplicates(client):
+    assert client.post("/register", json=NEW_PLAYER).status_code == 201
+    response = client.post("/register", json={**NEW_PLAYER, "email": "other@x.com"})
+    assert response.status_code == 400
+
+
+def test_login_with_wrong_password(client):
+    client.post("/register", json=NEW_PLAYER)
+    response = client.post(
+        "/login", json={"email": "misty@example.com", "password": "nope"}
+    )
+    assert response.status_code == 400
+
+
+# El hash se calcula sin una sesión (ni conexión) abierta
+def test_register_hashes_before_opening_a_session(client, monkeypatch):
+    sessions_open = []
+
+    def fake_hash(password):
+        sessions_open.append("db" in g)
+        return "hashed"
+
+    monkeypatch.setattr(players, "generate_password_hash", fake_hash)
+    assert client.post("/register", json=NEW_PLAYER).status_code == 201
+    assert sessions_open == [False]
+
+
+def test_busy_hasher_sheds_load(client, monkeypatch):
+    def busy(password):
+        raise PasswordHasherBusy("Server busy, try again later")
+
+    monkeypatch.setattr(players, "generate_password_hash", busy)
+    assert client.post("/register", json=NEW_PLAYER).status_code == 503
+
+
+def test_hash_timeout_is_busy(client, monkeypatch):
+    client.post("/register", json=NEW_PLAYER)
+    monkeypatch.setattr(passwords, "HASH_TIMEOUT", 0.05)
+    monkeypatch.setattr(
+        players,
+        "check_password_hash",
+        lambda pw_hash, password: passwords._run(time.sleep, 0.5),
+    )
+
+    response = client.post(
+        "/login", json={"email": "misty@example.com", "password": "pw"}
+    )
+    assert response.status_code == 503
+    assert response.get_json()["message"]
+
+
+# Si un proceso del pool muere, el pool se reemplaza y los hashes siguientes
+# funcionan
+def test_broken_pool_is_recreated():
+    with pytest.raises(PasswordHasherBusy):
+        passwords._run(os._exit, 1)
+
+    assert passwords.check_password_hash(passwords.generate_password_hash("pw"), "pw")
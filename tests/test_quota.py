@@ -0,0 +1,143 @@
+import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.dialects import mysql
+
+from helpers.quota import QuotaExceeded, consume_pokeballs
+from models.models import Player, PokeballHistory, PokemonOwned
+from routes import capture
+from tests.conftest import concurrently, mysql_only
+from tests.factories import add_players, add_species
+
+TODAY = datetime.date(2026, 3, 10)
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(rowcount=1)
+
+
+@pytest.fixture
+def player(db_session):
+    add_species(db_session)
+    add_players(db_session, "ash")
+    return "ash"
+
+
+def _counter(session, player_id):
+    session.expire_all()
+    return session.execute(
+        select(Player.pokeballs_opened, Player.last_opened).where(
+            Player.id == player_id
+        )
+    ).one()
+
+
+# MySQL evalúa el SET de izquierda a derecha: si last_opened se asignara
+# primero, el CASE ya vería la fecha de hoy y el contador nunca se reiniciaría
+def test_counter_is_assigned_before_last_opened():
+    session = _RecordingSession()
+    consume_pokeballs(session, "ash", 1, limit=5, today=TODAY)
+
+    [statement] = session.statements
+    sql = str(statement.compile(dialect=mysql.dialect()))
+    set_clause = sql.split(" SET ", 1)[1].split(" WHERE ", 1)[0]
+    assert set_clause.index("pokeballs_opened=") < set_clause.index("last_opened=")
+
+
+def test_consume_until_limit(db_session, player):
+    consume_pokeballs(db_session, player, 2, limit=3, today=TODAY)
+    consume_pokeballs(db_session, player, 1, limit=3, today=TODAY)
+    with pytest.raises(QuotaExceeded):
+        consume_pokeballs(db_session, player, 1, limit=3, today=TODAY)
+    db_session.commit()
+
+    assert tuple(_counter(db_session, player)) == (3, TODAY)
+
+
+# Con TEST_DB_URL esta prueba corre contra MySQL y cubre el orden del SET
+def test_counter_resets_next_day(db_session, player):
+    consume_pokeballs(db_session, player, 3, limit=3, today=TODAY)
+    db_session.commit()
+
+    tomorrow = TODAY + datetime.timedelta(days=1)
+    consume_pokeballs(db_session, player, 1, limit=3, today=tomorrow)
+    db_session.commit()
+
+    assert tuple(_counter(db_session, player)) == (1, tomorrow)
+
+
+def test_missing_player(db_session):
+    with pytest.raises(LookupError):
+        consume_pokeballs(db_session, "nobody", 1, limit=3, today=TODAY)
+
+
+def test_capture_routes_return_429(client, db_session, auth, player, monkeypatch):
+    monkeypatch.setattr(capture, "POKEBALLS_PER_DAY", 3)
+    headers = auth(player)
+
+    batch = client.post("/capture_pokemon/batch", headers=headers, json={"count": 2})
+    single = [
+        client.get("/capture_pokemon", headers=headers).status_code for _ in range(2)
+    ]
+
+    assert batch.status_code == 201
+    assert single == [201, 429]
+    assert _counter(db_session, player).pokeballs_opened == 3
+
+
+def _totals(session, player_id):
+    session.expire_all()
+    return (
+        session.scalar(select(Player.pokeballs_opened).where(Player.id == player_id)),
+        session.scalar(
+            select(func.count())
+            .select_from(PokemonOwned)
+            .where(PokemonOwned.player_id == player_id)
+        ),
+        session.scalar(
+            select(func.count())
+            .select_from(PokeballHistory)
+            .where(PokeballHistory.user_id == player_id)
+        ),
+    )
+
+
+# Capturas simultáneas del mismo jugador: el UPDATE condicional deja pasar
+# exactamente las que caben en la cuota
+@mysql_only
+def test_concurrent_single_captures(app, db_session, auth, player, monkeypatch):
+    monkeypatch.setattr(capture, "POKEBALLS_PER_DAY", 5)
+    headers = auth(player)
+
+    statuses = concurrently(
+        app, [lambda client: client.get("/capture_pokemon", headers=headers)] * 12
+    )
+
+    assert sorted(statuses) == [201] * 5 + [429] * 7
+    assert _totals(db_session, player) == (5, 5, 5)
+
+
+@mysql_only
+def test_concurrent_batch_captures(app, db_session, auth, player, monkeypatch):
+    monkeypatch.setattr(capture, "POKEBALLS_PER_DAY", 10)
+    headers = auth(player)
+
+    statuses = concurrently(
+        app,
+        [
+            lambda client: client.post(
+                "/capture_pokemon/batch", headers=headers, json={"count": 3}
+            )
+        ]
+        * 8,
+    )
+
+    assert sorted(statuses) == [201] * 3 + [429] * 5
+    assert _totals(db_session, player) == (9, 9, 9)
@@ -0,0 +1,103 @@
+import random
+from collections import Counter
+
+import pytest
+
+from helpers.capture_sampler import CaptureSampler
+from helpers.helpers import WeightedSampler
+
+# Reparto típico de capture_rate: cantidad de especies por tasa
+WEIGHTS = {3: 2, 45: 60, 90: 15, 120: 10, 190: 25, 255: 30, 75: 1}
+DRAWS = 200_000
+
+
+def _assert_matches(counts, weights, draws):
+    total = sum(weights.values())
+    for key, weight in weights.items():
+        expected = draws * weight / total
+        # Cinco desviaciones estándar de una binomial
+        sigma = (expected * (1 - weight / total)) ** 0.5
+        assert abs(counts[key] - expected) <= 5 * sigma + 1, key
+
+
+def test_draw_matches_weights():
+    random.seed(1)
+    sampler = WeightedSampler(WEIGHTS)
+    counts = Counter(sampler.draw() for _ in range(DRAWS))
+    assert set(counts) <= set(WEIGHTS)
+    _assert_matches(counts, WEIGHTS, DRAWS)
+
+
+def test_sample_matches_weights():
+    random.seed(2)
+    draws = WeightedSampler(WEIGHTS).sample(DRAWS)
+    assert len(draws) == DRAWS
+    _assert_matches(Counter(draws), WEIGHTS, DRAWS)
+
+
+# Mismo reparto que la implementación anterior con lista de boletos
+def test_same_distribution_as_ticket_list():
+    def ticket_choice(weights):
+        tickets = []
+        for key, value in weights.items():
+            tickets.extend([key] * value)
+        return random.choice(tickets)
+
+    random.seed(3)
+    old = Counter(ticket_choice(WEIGHTS) for _ in range(DRAWS // 4))
+    sampler = WeightedSampler(WEIGHTS)
+    new = Counter(sampler.draw() for _ in range(DRAWS // 4))
+    total = sum(WEIGHTS.values())
+    for key, weight in WEIGHTS.items():
+        p = weight / total
+        sigma = (2 * (DRAWS // 4) * p * (1 - p)) ** 0.5
+        assert abs(old[key] - new[key]) <= 5 * sigma + 1, key
+
+
+def test_zero_weights_are_never_drawn():
+    random.seed(4)
+    sampler = WeightedSampler({"a": 0, "b": 1, "c": -3})
+    assert sampler.keys == ("b",)
+    assert set(sampler.sample(1000)) == {"b"}
+
+
+def test_empty_weights_raise():
+    with pytest.raises(ValueError):
+        WeightedSampler({"a": 0})
+
+
+class _StaticSpecies:
+    def __init__(self, species):
+        self.species = species
+        self.invalidated = False
+
+    def snapshot(self):
+        return 1, self.species
+
+    def invalidate(self):
+        self.invalidated = True
+
+
+def test_capture_sampler_weights_by_species_count():
+    random.seed(5)
+    species = {
+        1: ("common_a", 255),
+        2: ("common_b", 255),
+        3: ("common_c", 255),
+        4: ("rare", 3),
+        5: ("unknown", None),
+    }
+    sampler = CaptureSampler(cache=_StaticSpecies(species))
+    counts = Counter(number for number, _ in sampler.sample(DRAWS))
+
+    assert 5 not in counts
+    # Cada especie con capture_rate tiene un boleto, como antes
+    _assert_matches(counts, {1: 1, 2: 1, 3: 1, 4: 1}, DRAWS)
+
+
+def test_capture_sampler_without_rates_reloads_next_time():
+    cache = _StaticSpecies({1: ("unknown", None)})
+
+    with pytest.raises(ValueError):
+        CaptureSampler(cache).draw()
+    assert cache.invalidated
@@ -0,0 +1,150 @@
+import pytest
+from sqlalchemy import insert, select
+
+from models.models import PokemonOwned, Trade, TradeStatus
+from tests.conftest import concurrently, mysql_only
+from tests.factories import add_friends, add_players, add_pokemon, add_species
+
+
+@pytest.fixture
+def trades(db_session):
+    add_species(db_session)
+    add_players(db_session, "ash", "misty", "brock")
+    add_friends(db_session, "ash", "misty", "brock")
+    add_pokemon(db_session, "ash", "ash_pika")
+    add_pokemon(db_session, "misty", "misty_star")
+    add_pokemon(db_session, "brock", "brock_onix")
+    # Dos intercambios pendientes que ofrecen el mismo Pokemon de ash
+    db_session.execute(
+        insert(Trade),
+        [
+            {
+                "id": "t_misty",
+                "requester_id": "ash",
+                "receiver_id": "misty",
+                "requester_pokemon_id": "ash_pika",
+                "receiver_pokemon_id": "misty_star",
+                "status": TradeStatus.pending,
+            },
+            {
+                "id": "t_brock",
+                "requester_id": "ash",
+                "receiver_id": "brock",
+                "requester_pokemon_id": "ash_pika",
+                "receiver_pokemon_id": "brock_onix",
+                "status": TradeStatus.pending,
+            },
+        ],
+    )
+    db_session.commit()
+
+
+def _owners(session):
+    session.expire_all()
+    return dict(session.execute(select(PokemonOwned.id, PokemonOwned.player_id)).all())
+
+
+def _statuses(session):
+    session.expire_all()
+    return dict(session.execute(select(Trade.id, Trade.status)).all())
+
+
+def test_confirm_swaps_and_rejects_conflicting_trades(
+    client, db_session, auth, trades, count_queries
+):
+    headers = auth("misty")
+    with count_queries() as statements:
+        response = client.post(
+            "/trade/confirm", headers=headers, json={"trade_id": "t_misty"}
+        )
+
+    assert response.status_code == 202
+    # Una lectura bloqueante y dos UPDATE
+    assert [s.split()[0] for s in statements] == ["SELECT", "UPDATE", "UPDATE"]
+    assert _owners(db_session) == {
+        "ash_pika": "misty",
+        "misty_star": "ash",
+        "brock_onix": "brock",
+    }
+    assert _statuses(db_session) == {
+        "t_misty": TradeStatus.accepted,
+        "t_brock": TradeStatus.rejected,
+    }
+
+
+def test_confirm_twice(client, auth, trades):
+    headers = auth("misty")
+    body = {"trade_id": "t_misty"}
+    assert client.post("/trade/confirm", headers=headers, json=body).status_code == 202
+    assert client.post("/trade/confirm", headers=headers, json=body).status_code == 400
+
+
+def test_only_receiver_can_confirm(client, auth, trades):
+    response = client.post(
+        "/trade/confirm", headers=auth("ash"), json={"trade_id": "t_misty"}
+    )
+    assert response.status_code == 403
+
+
+def test_confirm_after_pokemon_changed_owner(client, db_session, auth, trades):
+    db_session.execute(
+        PokemonOwned.__table__.update()
+        .where(PokemonOwned.id == "misty_star")
+        .values(player_id="brock")
+    )
+    db_session.commit()
+
+    response = client.post(
+        "/trade/confirm", headers=auth("misty"), json={"trade_id": "t_misty"}
+    )
+    assert response.status_code == 409
+
+
+# Confirmaciones simultáneas del mismo intercambio: FOR UPDATE deja pasar una
+@mysql_only
+def test_concurrent_confirms_swap_once(app, db_session, auth, trades):
+    headers = auth("misty")
+    statuses = concurrently(
+        app,
+        [
+            lambda client: client.post(
+                "/trade/confirm", headers=headers, json={"trade_id": "t_misty"}
+            )
+        ]
+        * 8,
+    )
+
+    assert sorted(statuses) == [202] + [400] * 7
+    assert _owners(db_session)["ash_pika"] == "misty"
+    assert _owners(db_session)["misty_star"] == "ash"
+
+
+# Dos intercambios que comparten un Pokemon, confirmados a la vez por sus
+# receptores: solo uno puede llevárselo
+@mysql_only
+def test_concurrent_conflicting_confirms(app, db_session, auth, trades):
+    misty, brock = auth("misty"), auth("brock")
+    statuses = concurrently(
+        app,
+        [
+            lambda client: client.post(
+                "/trade/confirm", headers=misty, json={"trade_id": "t_misty"}
+            ),
+            lambda client: client.post(
+                "/trade/confirm", headers=brock, json={"trade_id": "t_brock"}
+            ),
+        ],
+    )
+
+    assert sorted(statuses)[0] == 202
+    assert sorted(statuses)[1] in (400, 409)
+    owners = _owners(db_session)
+    accepted = [
+        trade_id
+        for trade_id, status in _statuses(db_session).items()
+        if status == TradeStatus.accepted
+    ]
+    assert len(accepted) == 1
+    winner = "misty" if accepted == ["t_misty"] else "brock"
+    assert owners["ash_pika"] == winner
+    assert list(owners.values()).count("ash") == 1
@@ -0,0 +1,6 @@
+# Punto de entrada de producción:
+#
+#   gunicorn -c gunicorn.conf.py wsgi:application
+from app import create_app
+
+application = create_app()